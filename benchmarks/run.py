@@ -0,0 +1,186 @@
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from benchmarks.synthetic import SyntheticApiClient, SyntheticCluster
+from k8s_diagram.parser import Parser
+from k8s_diagram.resources import RESOURCES
+from k8s_diagram.view import View
+
+FETCH_STAGES = [
+    "parse_namespaces",
+    "parse_services",
+    "parse_pods",
+    "parse_deployments",
+    "parse_replica_sets",
+    "parse_stateful_sets",
+    "parse_jobs",
+    "parse_cron_jobs",
+]
+
+ASSOCIATE_STAGES = [
+    "index_pod_labels",
+    "index_owners",
+    "associate_services_with_namespaces",
+    "associate_pods_with_namespaces",
+    "associate_pods_with_services",
+    "associate_deployments_with_namespaces",
+    "associate_replica_sets_with_namespaces",
+    "associate_stateful_sets_with_namespaces",
+    "associate_pods_with_stateful_sets",
+    "associate_jobs_with_namespaces",
+    "associate_cron_jobs_with_namespaces",
+    "associate_owners",
+]
+
+ORGANIZE_STAGES = [
+    "organize_into_systems",
+    "organize_into_apps",
+]
+
+
+@dataclass
+class StageResult:
+    pods: int
+    stage: str
+    seconds: float
+    peak_bytes: int | None
+    bytes_per_node: float | None = None
+
+
+def measure(
+    api_client: SyntheticApiClient,
+    stage: str,
+    function: Callable,
+    trace_memory: bool
+) -> tuple[StageResult, object]:
+    gc.collect()
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    server_seconds = api_client.server_seconds
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start - (api_client.server_seconds - server_seconds)
+
+    peak_bytes = tracemalloc.get_traced_memory()[1] if trace_memory else None
+
+    return StageResult(api_client.cluster.pod_count, stage, seconds, peak_bytes), result
+
+
+def run(cluster: SyntheticCluster, parser_options: dict, trace_memory: bool, diagrams: bool) -> list[StageResult]:
+    api_client = SyntheticApiClient(cluster)
+    parser = Parser(api_client=api_client, **parser_options)
+    results = []
+
+    gc.collect()
+    baseline_bytes = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+
+    stages = FETCH_STAGES + ASSOCIATE_STAGES + ORGANIZE_STAGES
+    if parser.view is not None:
+        stages = ["fetch"] + parser.plan.associate_stages + ORGANIZE_STAGES
+
+    for stage in stages:
+        result, _ = measure(api_client, stage, getattr(parser, stage), trace_memory)
+        results.append(result)
+
+    if trace_memory:
+        gc.collect()
+        retained_bytes = tracemalloc.get_traced_memory()[0] - baseline_bytes
+        nodes = sum(len(getattr(parser, resource.attribute)) for resource in RESOURCES)
+        results.append(StageResult(cluster.pod_count, "retained", 0.0, retained_bytes, retained_bytes / nodes))
+
+    result, graph = measure(api_client, "graph", parser.graph, trace_memory)
+    results.append(result)
+
+    with open(os.devnull, "w") as sink:
+        result, _ = measure(api_client, "to_mermaid_js_code", lambda: graph.write_mermaid_js_code(sink), trace_memory)
+        results.append(result)
+
+    if diagrams:
+        result, _ = measure(api_client, "to_diagrams", graph.to_diagrams, trace_memory)
+        results.append(result)
+
+    return results
+
+
+def print_results(results: list[StageResult]) -> None:
+    print(f"{'pods':>8}  {'stage':<42}  {'seconds':>9}  {'peak MiB':>9}  {'B/node':>7}")
+    for result in results:
+        peak = "" if result.peak_bytes is None else f"{result.peak_bytes / 1024 / 1024:9.1f}"
+        per_node = "" if result.bytes_per_node is None else f"{result.bytes_per_node:7.0f}"
+        print(f"{result.pods:>8}  {result.stage:<42}  {result.seconds:9.4f}  {peak:>9}  {per_node:>7}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the k8s_diagram parse and render pipeline on a synthetic cluster.")
+    parser.add_argument("--pods", type=int, nargs="+", default=[1_000, 10_000, 100_000, 500_000])
+    parser.add_argument(
+        "--namespaces", type=int, default=None,
+        help="spread each --pods count over this many namespaces by scaling --deployments"
+    )
+    parser.add_argument("--deployments", type=int, default=20, help="deployments per namespace")
+    parser.add_argument("--replica-sets-per-deployment", type=int, default=1)
+    parser.add_argument("--pods-per-replica-set", type=int, default=4)
+    parser.add_argument("--services", type=int, default=None, help="services per namespace (default: one per deployment)")
+    parser.add_argument("--stateful-sets", type=int, default=2, help="stateful sets per namespace")
+    parser.add_argument("--pods-per-stateful-set", type=int, default=3)
+    parser.add_argument("--cron-jobs", type=int, default=2, help="cron jobs per namespace")
+    parser.add_argument("--jobs-per-cron-job", type=int, default=1, help="jobs per cron job, each with one pod")
+    parser.add_argument("--containers", type=int, default=2, help="containers per pod template")
+    parser.add_argument("--apps", type=int, default=10, help="distinct app label values per namespace")
+    parser.add_argument("--systems", type=int, default=3, help="distinct part-of label values per namespace")
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--raw-json", action="store_true")
+    parser.add_argument("--metadata-only", action="store_true")
+    parser.add_argument("--view", nargs="+", default=None, help="only show these kinds, e.g. services deployments")
+    parser.add_argument("--diagrams", action="store_true", help="also time Graph.to_diagrams (needs graphviz)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows every stage down")
+    parser.add_argument("--json", dest="json_path", default=None, help="also write the results as JSON lines")
+    args = parser.parse_args()
+
+    parser_options = dict(
+        page_size=args.page_size,
+        raw_json=args.raw_json,
+        metadata_only=args.metadata_only,
+        view=View(set(args.view)) if args.view is not None else None,
+    )
+    trace_memory = not args.no_memory
+
+    if trace_memory:
+        tracemalloc.start()
+
+    results = []
+    for pods in args.pods:
+        cluster = SyntheticCluster.for_pod_count(
+            pods,
+            namespaces=args.namespaces,
+            deployments=args.deployments,
+            replica_sets_per_deployment=args.replica_sets_per_deployment,
+            pods_per_replica_set=args.pods_per_replica_set,
+            services=args.services,
+            stateful_sets=args.stateful_sets,
+            pods_per_stateful_set=args.pods_per_stateful_set,
+            cron_jobs=args.cron_jobs,
+            jobs_per_cron_job=args.jobs_per_cron_job,
+            containers=args.containers,
+            apps=args.apps,
+            systems=args.systems,
+        )
+        results.extend(run(cluster, parser_options, trace_memory, args.diagrams))
+
+    print_results(results)
+
+    if args.json_path is not None:
+        with open(args.json_path, "w") as file:
+            for result in results:
+                file.write(json.dumps(asdict(result)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import itertools
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Iterator
+from urllib.parse import urlparse
+
+from kubernetes.client import ApiClient, ApiException, Configuration
+
+PARTIAL_OBJECT_METADATA = "as=PartialObjectMetadataList"
+RESOURCES = {"namespaces", "services", "pods", "deployments", "replicasets", "statefulsets", "jobs", "cronjobs"}
+NAMESPACED_PATH = re.compile(r"/namespaces/(?P<namespace>[^/]+)/(?P<resource>[^/]+)$")
+
+
+@dataclass(frozen=True)
+class SyntheticCluster:
+    namespaces: int = 10
+    deployments: int = 20
+    pods_per_replica_set: int = 4
+    replica_sets_per_deployment: int = 1
+    stateful_sets: int = 2
+    pods_per_stateful_set: int = 3
+    cron_jobs: int = 2
+    jobs_per_cron_job: int = 1
+    services: int | None = None
+    apps: int = 10
+    systems: int = 3
+    containers: int = 2
+
+    @classmethod
+    def for_pod_count(cls, pods: int, namespaces: int | None = None, **kwargs) -> "SyntheticCluster":
+        if namespaces is None:
+            shape = cls(namespaces=1, **kwargs)
+            namespaces = max(1, round(pods / shape.pods_per_namespace))
+
+            return cls(namespaces=namespaces, **kwargs)
+
+        kwargs["deployments"] = 0
+        shape = cls(namespaces=namespaces, **kwargs)
+        pods_per_deployment = shape.replica_sets_per_deployment * shape.pods_per_replica_set
+        kwargs["deployments"] = max(0, round((pods / namespaces - shape.pods_per_namespace) / pods_per_deployment))
+
+        return cls(namespaces=namespaces, **kwargs)
+
+    @property
+    def pods_per_namespace(self) -> int:
+        return (
+            self.deployments * self.replica_sets_per_deployment * self.pods_per_replica_set
+            + self.stateful_sets * self.pods_per_stateful_set
+            + self.cron_jobs * self.jobs_per_cron_job
+        )
+
+    @property
+    def service_count(self) -> int:
+        return self.deployments if self.services is None else self.services
+
+    @property
+    def pod_count(self) -> int:
+        return self.namespaces * self.pods_per_namespace
+
+    def namespace_names(self) -> list[str]:
+        return [f"ns-{n}" for n in range(self.namespaces)]
+
+    def labels(self, index: int) -> dict[str, str]:
+        return {
+            "app.kubernetes.io/name": f"app-{index % self.apps}",
+            "app.kubernetes.io/part-of": f"system-{index % self.systems}",
+            "pod-template-hash": f"h{index}",
+        }
+
+    @staticmethod
+    def metadata(
+        name: str,
+        namespace: str | None,
+        labels: dict[str, str] | None = None,
+        owner: tuple[str, str] | None = None
+    ) -> dict:
+        metadata = {
+            "name": name,
+            "uid": f"{namespace}/{name}",
+            "resourceVersion": "1",
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "labels": labels,
+        }
+        if namespace is not None:
+            metadata["namespace"] = namespace
+        if owner is not None:
+            kind, owner_name = owner
+            metadata["ownerReferences"] = [
+                {
+                    "apiVersion": "v1",
+                    "kind": kind,
+                    "name": owner_name,
+                    "uid": f"{namespace}/{owner_name}",
+                    "controller": True,
+                }
+            ]
+
+        return metadata
+
+    def pod_spec(self) -> dict:
+        return {
+            "containers": [
+                {
+                    "name": f"container-{c}",
+                    "image": "registry.example.com/app:1.0.0",
+                    "env": [{"name": f"ENV_{e}", "value": "value"} for e in range(8)],
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}},
+                }
+                for c in range(self.containers)
+            ]
+        }
+
+    def items(self, resource: str, namespace: str) -> Iterator[dict]:
+        match resource:
+            case "services":
+                for d in range(self.service_count):
+                    labels = self.labels(d)
+                    yield {
+                        "metadata": self.metadata(f"svc-{d}", namespace, labels),
+                        "spec": {"selector": {"app.kubernetes.io/name": labels["app.kubernetes.io/name"]}},
+                    }
+            case "deployments":
+                for d in range(self.deployments):
+                    labels = self.labels(d)
+                    yield {
+                        "metadata": self.metadata(f"deploy-{d}", namespace, labels),
+                        "spec": {"selector": {"matchLabels": labels}, "template": {"spec": self.pod_spec()}},
+                    }
+            case "replicasets":
+                for d in range(self.deployments):
+                    for r in range(self.replica_sets_per_deployment):
+                        yield {
+                            "metadata": self.metadata(f"deploy-{d}-rs{r}", namespace, self.labels(d), ("Deployment", f"deploy-{d}")),
+                            "spec": {"selector": {"matchLabels": self.labels(d)}, "template": {"spec": self.pod_spec()}},
+                        }
+            case "statefulsets":
+                for s in range(self.stateful_sets):
+                    labels = {"app": f"db-{s}"}
+                    yield {
+                        "metadata": self.metadata(f"db-{s}", namespace, labels),
+                        "spec": {"selector": {"matchLabels": labels}, "serviceName": f"db-{s}", "template": {}},
+                    }
+            case "cronjobs":
+                for c in range(self.cron_jobs):
+                    yield {
+                        "metadata": self.metadata(f"cron-{c}", namespace, {"app": f"batch-{c}"}),
+                        "spec": {"schedule": "0 * * * *", "jobTemplate": {}},
+                    }
+            case "jobs":
+                for c in range(self.cron_jobs):
+                    for j in range(self.jobs_per_cron_job):
+                        yield {
+                            "metadata": self.metadata(f"cron-{c}-{100 + j}", namespace, {"app": f"batch-{c}"}, ("CronJob", f"cron-{c}")),
+                            "spec": {"template": {}},
+                        }
+            case "pods":
+                for d in range(self.deployments):
+                    for r in range(self.replica_sets_per_deployment):
+                        for p in range(self.pods_per_replica_set):
+                            yield self.pod(f"deploy-{d}-rs{r}-p{p}", namespace, self.labels(d), ("ReplicaSet", f"deploy-{d}-rs{r}"))
+                for s in range(self.stateful_sets):
+                    for p in range(self.pods_per_stateful_set):
+                        yield self.pod(f"db-{s}-{p}", namespace, {"app": f"db-{s}"}, ("StatefulSet", f"db-{s}"))
+                for c in range(self.cron_jobs):
+                    for j in range(self.jobs_per_cron_job):
+                        yield self.pod(f"cron-{c}-{100 + j}-x", namespace, {"app": f"batch-{c}"}, ("Job", f"cron-{c}-{100 + j}"))
+
+    def pod(self, name: str, namespace: str, labels: dict[str, str], owner: tuple[str, str]) -> dict:
+        return {
+            "metadata": self.metadata(name, namespace, labels, owner),
+            "spec": self.pod_spec(),
+            "status": {"phase": "Running", "conditions": [{"type": "Ready", "status": "True"}]},
+        }
+
+    def count(self, resource: str) -> int:
+        match resource:
+            case "namespaces":
+                return 1
+            case "services":
+                return self.service_count
+            case "deployments":
+                return self.deployments
+            case "replicasets":
+                return self.deployments * self.replica_sets_per_deployment
+            case "statefulsets":
+                return self.stateful_sets
+            case "cronjobs":
+                return self.cron_jobs
+            case "jobs":
+                return self.cron_jobs * self.jobs_per_cron_job
+            case "pods":
+                return self.pods_per_namespace
+
+    def list_items(self, resource: str, namespaces: list[str], start: int = 0) -> Iterator[dict]:
+        per_namespace = self.count(resource)
+        skipped_namespaces = start // per_namespace if per_namespace > 0 else len(namespaces)
+        offset = start - skipped_namespaces * per_namespace
+
+        for namespace in namespaces[skipped_namespaces:]:
+            if resource == "namespaces":
+                items = iter([{"metadata": self.metadata(namespace, None), "status": {"phase": "Active"}}])
+            else:
+                items = self.items(resource, namespace)
+
+            yield from itertools.islice(items, offset, None)
+            offset = 0
+
+
+class SyntheticResponse:
+    def __init__(self, data: bytes, status: int = 200):
+        self.data = data
+        self.status = status
+        self.reason = "OK"
+
+    def getheaders(self) -> dict:
+        return {"Content-Type": "application/json"}
+
+    def getheader(self, name: str, default=None):
+        return self.getheaders().get(name, default)
+
+    def release_conn(self) -> None:
+        pass
+
+
+class SyntheticApiClient(ApiClient):
+    def __init__(self, cluster: SyntheticCluster):
+        super().__init__(configuration=Configuration(host="http://synthetic.invalid"))
+
+        self.cluster = cluster
+        self.requests = 0
+        self.bytes_sent = 0
+        self.server_seconds = 0.0
+
+    def request(self, method, url, query_params=None, headers=None, post_params=None, body=None,
+                _preload_content=True, _request_timeout=None):
+        start = time.perf_counter()
+        try:
+            return self.respond(url, query_params, headers)
+        finally:
+            self.server_seconds += time.perf_counter() - start
+
+    def respond(self, url, query_params=None, headers=None) -> SyntheticResponse:
+        path = urlparse(url).path
+        query = dict(query_params or [])
+        accept = (headers or {}).get("Accept", "")
+
+        namespaces = self.cluster.namespace_names()
+        match = NAMESPACED_PATH.search(path)
+        if match is not None:
+            resource = match.group("resource")
+            namespaces = [match.group("namespace")]
+        else:
+            resource = path.rstrip("/").rsplit("/", 1)[-1]
+
+        if resource not in RESOURCES:
+            raise ApiException(status=404, reason=f"unknown resource {resource}")
+
+        for condition in filter(None, (query.get("fieldSelector") or "").split(",")):
+            field, value = condition.split("!=")
+            if field in ("metadata.namespace", "metadata.name"):
+                namespaces = [n for n in namespaces if n != value]
+
+        start = int(query.get("continue") or 0)
+        limit = int(query["limit"]) if "limit" in query else None
+
+        items = []
+        _continue = None
+        for index, item in enumerate(self.cluster.list_items(resource, namespaces, start), start):
+            if limit is not None and len(items) == limit:
+                _continue = str(index)
+                break
+            if PARTIAL_OBJECT_METADATA in accept:
+                item = {"kind": "PartialObjectMetadata", "apiVersion": "meta.k8s.io/v1", "metadata": item["metadata"]}
+            items.append(item)
+
+        page = {"kind": "List", "apiVersion": "v1", "metadata": {"resourceVersion": "1", "continue": _continue}, "items": items}
+        data = json.dumps(page).encode("utf-8")
+
+        self.requests += 1
+        self.bytes_sent += len(data)
+
+        return SyntheticResponse(data)
@@ -0,0 +1,219 @@
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterator, TextIO
+
+from k8s_diagram.parser import Parser
+from k8s_diagram.resources import RESOURCES
+from k8s_diagram.snapshot import load_snapshot
+from k8s_diagram.types.base import Graph, GraphNode, SubGraph
+from k8s_diagram.types.kubernetes import CollapsedGroup, PodGroup, Service, StatefulSet
+
+NodeKey = tuple[str | None, str, str]
+Relation = tuple[NodeKey, NodeKey]
+
+COMPARED_ATTRIBUTES = ("name", "namespace", "app", "system", "css_class", "labels", "annotations")
+KIND_ATTRIBUTES: dict[type[GraphNode], tuple[str, ...]] = {
+    Service: ("selectors",),
+    StatefulSet: ("selectors",),
+    PodGroup: ("count",),
+    CollapsedGroup: ("count",),
+}
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+CONTEXT = "context"
+
+
+def node_key(graph_node: GraphNode) -> NodeKey:
+    return graph_node.namespace, type(graph_node).__name__, graph_node.object_name or graph_node.name
+
+
+def node_signature(graph_node: GraphNode) -> tuple:
+    attributes = COMPARED_ATTRIBUTES + KIND_ATTRIBUTES.get(type(graph_node), ())
+
+    return tuple(getattr(graph_node, attribute, None) for attribute in attributes)
+
+
+def leaf_nodes(state: Graph | Parser) -> Iterator[GraphNode]:
+    if isinstance(state, Parser):
+        for resource in RESOURCES[1:]:
+            yield from (getattr(state, resource.attribute) or dict()).values()
+        return
+
+    for graph_node in (state.graph_nodes or dict()).values():
+        if isinstance(graph_node, SubGraph):
+            yield from leaf_nodes(graph_node)
+        else:
+            yield graph_node
+
+
+@dataclass
+class DiffState:
+    graph_nodes: dict[NodeKey, GraphNode] = field(default_factory=dict)
+    relations: dict[Relation, None] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, state: Graph | Parser) -> "DiffState":
+        diff_state = cls()
+
+        keys: dict[str, NodeKey] = dict()
+        for graph_node in leaf_nodes(state):
+            key = node_key(graph_node)
+            keys[graph_node.id] = key
+            diff_state.graph_nodes[key] = graph_node
+
+        for key, graph_node in diff_state.graph_nodes.items():
+            for related_id in (graph_node.related_nodes or dict()).keys():
+                related_key = keys.get(related_id)
+                if related_key is not None:
+                    diff_state.relations[(key, related_key)] = None
+
+        return diff_state
+
+
+@dataclass
+class GraphDiff:
+    old: DiffState
+    new: DiffState
+    context: int = 1
+    added: set[NodeKey] = field(default_factory=set)
+    removed: set[NodeKey] = field(default_factory=set)
+    changed: set[NodeKey] = field(default_factory=set)
+    added_relations: dict[Relation, None] = field(default_factory=dict)
+    removed_relations: dict[Relation, None] = field(default_factory=dict)
+
+    def __post_init__(self):
+        old_nodes = self.old.graph_nodes
+        new_nodes = self.new.graph_nodes
+
+        self.added = {key for key in new_nodes.keys() if key not in old_nodes}
+        self.removed = {key for key in old_nodes.keys() if key not in new_nodes}
+        self.changed = {
+            key
+            for key, graph_node in new_nodes.items()
+            if key in old_nodes and node_signature(graph_node) != node_signature(old_nodes[key])
+        }
+
+        self.added_relations = {relation: None for relation in self.new.relations if relation not in self.old.relations}
+        self.removed_relations = {relation: None for relation in self.old.relations if relation not in self.new.relations}
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.added_relations or self.removed_relations)
+
+    def status(self, key: NodeKey) -> str:
+        if key in self.added:
+            return ADDED
+        if key in self.removed:
+            return REMOVED
+        if key in self.changed:
+            return CHANGED
+
+        return CONTEXT
+
+    def selected_keys(self) -> set[NodeKey]:
+        selected = self.added | self.removed | self.changed
+        for source, target in itertools.chain(self.added_relations, self.removed_relations):
+            selected.add(source)
+            selected.add(target)
+
+        if self.context <= 0:
+            return selected
+
+        neighbours: dict[NodeKey, list[NodeKey]] = defaultdict(list)
+        for source, target in itertools.chain(self.new.relations, self.removed_relations):
+            neighbours[source].append(target)
+            neighbours[target].append(source)
+
+        frontier = list(selected)
+        for _ in range(self.context):
+            next_frontier = []
+            for key in frontier:
+                for neighbour in neighbours.get(key, ()):
+                    if neighbour not in selected:
+                        selected.add(neighbour)
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+
+        return selected
+
+    def to_mermaid_js_code(self) -> str:
+        return "".join(self.iter_mermaid_js_code())
+
+    def iter_mermaid_js_code(self) -> Iterator[str]:
+        yield "graph TB\n"
+
+        selected = self.selected_keys()
+        ordered = [key for key in self.new.graph_nodes.keys() if key in selected]
+        ordered += [key for key in self.old.graph_nodes.keys() if key in selected and key not in self.new.graph_nodes]
+
+        ids = {key: f"n{index}" for index, key in enumerate(ordered)}
+
+        groups: dict[str | None, dict[str | None, dict[str | None, list[NodeKey]]]] = dict()
+        for key in ordered:
+            graph_node = self.new.graph_nodes.get(key) or self.old.graph_nodes[key]
+            groups.setdefault(graph_node.namespace, dict()).setdefault(graph_node.system, dict()).setdefault(graph_node.app, []).append(key)
+
+        subgraph_count = 0
+        for namespace, systems in groups.items():
+            yield f"subgraph s{subgraph_count}[\"Namespace: {namespace}\"]\n"
+            subgraph_count += 1
+
+            for system, apps in systems.items():
+                if system is not None:
+                    yield f"subgraph s{subgraph_count}[\"System: {system}\"]\n"
+                    subgraph_count += 1
+
+                for app, keys in apps.items():
+                    if app is not None:
+                        yield f"subgraph s{subgraph_count}[\"App: {app}\"]\n"
+                        subgraph_count += 1
+
+                    for key in keys:
+                        _, kind, name = key
+                        yield f"{ids[key]}(\"{kind}: {name}\"):::{self.status(key)}\n"
+
+                    if app is not None:
+                        yield "end\n"
+
+                if system is not None:
+                    yield "end\n"
+
+            yield "end\n"
+
+        link_styles = []
+        link_count = 0
+        for relations, arrow, style in (
+            ((relation for relation in self.new.relations if relation not in self.added_relations), "-->", None),
+            (self.added_relations, "==>", "stroke:#2da44e,stroke-width:3px"),
+            (self.removed_relations, "-.->", "stroke:#cf222e"),
+        ):
+            for source, target in relations:
+                if source not in ids or target not in ids:
+                    continue
+
+                yield f"{ids[source]} {arrow} {ids[target]}\n"
+                if style is not None:
+                    link_styles.append(f"linkStyle {link_count} {style};\n")
+                link_count += 1
+
+        yield from link_styles
+
+        yield "classDef added fill:#dafbe1,stroke:#2da44e;\n"
+        yield "classDef removed fill:#ffebe9,stroke:#cf222e,stroke-dasharray:4 2;\n"
+        yield "classDef changed fill:#fff8c5,stroke:#bf8700;\n"
+        yield "classDef context fill:#f6f8fa,stroke:#8c959f;\n"
+
+    def write_mermaid_js_code(self, sink: TextIO) -> None:
+        for chunk in self.iter_mermaid_js_code():
+            sink.write(chunk)
+
+
+def diff(old: Graph | Parser, new: Graph | Parser, context: int = 1) -> GraphDiff:
+    return GraphDiff(DiffState.of(old), DiffState.of(new), context=context)
+
+
+def diff_snapshots(old_path: str, new_path: str, context: int = 1) -> GraphDiff:
+    return diff(load_snapshot(old_path), load_snapshot(new_path), context=context)
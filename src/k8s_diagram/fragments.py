@@ -0,0 +1,111 @@
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from k8s_diagram.types.base import SubGraph
+
+ENTRY_OVERHEAD = 512
+
+
+class SubGraphRef(weakref.ref):
+    __slots__ = ("key",)
+
+
+@dataclass(slots=True)
+class Fragment:
+    ref: SubGraphRef
+    revision: int
+    relations: int
+    segments: tuple[str, ...]
+    child_ids: tuple[str, ...]
+    size: int
+
+
+class FragmentCache:
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.fragments: OrderedDict[int, Fragment] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def iter_fragment(self, subgraph: "SubGraph") -> Iterator[str]:
+        key = id(subgraph)
+        revision = subgraph.revision
+        relations = subgraph.relations_key()
+
+        fragment = self.fragments.get(key)
+        if (
+            fragment is not None
+            and fragment.ref() is subgraph
+            and fragment.revision == revision
+            and fragment.relations == relations
+        ):
+            self.fragments.move_to_end(key)
+            self.hits += 1
+
+            yield fragment.segments[0]
+            for child_id, segment in zip(fragment.child_ids, fragment.segments[1:]):
+                yield from subgraph.graph_nodes[child_id].iter_mermaid_js_code(self)
+                yield segment
+
+            return
+
+        self.misses += 1
+        segments: list[str] = []
+        child_ids: list[str] = []
+        pending: list[str] = []
+
+        for part in subgraph.iter_fragment():
+            if isinstance(part, str):
+                pending.append(part)
+                yield part
+            else:
+                segments.append("".join(pending))
+                pending = []
+                child_ids.append(part.id)
+                yield from part.iter_mermaid_js_code(self)
+
+        segments.append("".join(pending))
+
+        self.store(subgraph, revision, relations, tuple(segments), tuple(child_ids))
+
+    def store(
+        self,
+        subgraph: "SubGraph",
+        revision: int,
+        relations: int,
+        segments: tuple[str, ...],
+        child_ids: tuple[str, ...]
+    ) -> None:
+        size = ENTRY_OVERHEAD + sum(map(len, segments))
+        if size > self.max_bytes:
+            return
+
+        key = id(subgraph)
+        self.discard(key)
+
+        ref = SubGraphRef(subgraph, self.collected)
+        ref.key = key
+        self.fragments[key] = Fragment(ref, revision, relations, segments, child_ids, size)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes:
+            _, evicted = self.fragments.popitem(last=False)
+            self.bytes -= evicted.size
+
+    def collected(self, ref: SubGraphRef) -> None:
+        fragment = self.fragments.get(ref.key)
+        if fragment is not None and fragment.ref is ref:
+            self.discard(ref.key)
+
+    def discard(self, key: int) -> None:
+        fragment = self.fragments.pop(key, None)
+        if fragment is not None:
+            self.bytes -= fragment.size
+
+    def clear(self) -> None:
+        self.fragments.clear()
+        self.bytes = 0
@@ -0,0 +1,119 @@
+import base64
+import hashlib
+import os
+import tempfile
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    import requests
+
+
+class ImageBackendProtocol(Protocol):
+    def fetch(self, code: str) -> bytes: ...
+
+
+class ImageCache:
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(code: str) -> str:
+        return hashlib.sha256(code.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.img")
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return content
+
+    def put(self, key: str, content: bytes) -> None:
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(content)
+
+        os.replace(temporary_path, self.path(key))
+
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".img"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            total -= size
+
+
+class MermaidInkBackend:
+    def __init__(
+        self,
+        base_url: str = "https://mermaid.ink",
+        timeout: float = 30.0,
+        session: "requests.Session | None" = None,
+        cache: ImageCache | None = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session = session
+        self.cache = cache
+
+    @property
+    def session(self) -> "requests.Session":
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+
+        return self._session
+
+    def fetch(self, code: str) -> bytes:
+        key = ImageCache.key(code)
+
+        if self.cache is not None:
+            content = self.cache.get(key)
+            if content is not None:
+                return content
+
+        base64_string = base64.b64encode(code.encode("utf-8")).decode("ascii")
+
+        response = self.session.get(f"{self.base_url}/img/{base64_string}", timeout=self.timeout)
+        response.raise_for_status()
+        content = response.content
+
+        if self.cache is not None:
+            self.cache.put(key, content)
+
+        return content
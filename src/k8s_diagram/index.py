@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from k8s_diagram.types.base import GraphNode
+
+
+@dataclass
+class LabelIndex:
+    buckets: dict[tuple[str, str, str], dict[str, GraphNode]] = field(default_factory=dict)
+
+    def add(self, graph_node: GraphNode, labels: dict[str, str] | None) -> None:
+        if labels is None:
+            return
+
+        for key, value in labels.items():
+            bucket = self.buckets.get((graph_node.namespace, key, value))
+            if bucket is None:
+                bucket = dict()
+                self.buckets[(graph_node.namespace, key, value)] = bucket
+
+            bucket[graph_node.id] = graph_node
+
+    def select(self, namespace: str, selectors: dict[str, str] | None) -> list[GraphNode]:
+        if not selectors:
+            return []
+
+        buckets = []
+        for key, value in selectors.items():
+            bucket = self.buckets.get((namespace, key, value))
+            if bucket is None:
+                return []
+
+            buckets.append(bucket)
+
+        buckets.sort(key=len)
+        smallest, others = buckets[0], buckets[1:]
+
+        return [gn for gn_id, gn in smallest.items() if all(gn_id in bucket for bucket in others)]
+
+
+@dataclass
+class OwnerIndex:
+    buckets: dict[type[GraphNode], dict[tuple[str, str], GraphNode]] = field(default_factory=dict)
+
+    def add(self, graph_nodes: Iterable[GraphNode]) -> None:
+        for graph_node in graph_nodes:
+            if graph_node.object_uid is None:
+                continue
+
+            bucket = self.buckets.get(type(graph_node))
+            if bucket is None:
+                bucket = dict()
+                self.buckets[type(graph_node)] = bucket
+
+            bucket[(graph_node.namespace, graph_node.object_uid)] = graph_node
+
+    def owner(self, graph_node: GraphNode, owner_types: Iterable[type[GraphNode]]) -> GraphNode | None:
+        if graph_node.owner_uid is None:
+            return None
+
+        key = (graph_node.namespace, graph_node.owner_uid)
+        for owner_type in owner_types:
+            bucket = self.buckets.get(owner_type)
+            if bucket is not None and key in bucket:
+                return bucket[key]
+
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+
+def group_by(
+    graph_nodes: dict[str, GraphNode],
+    key: Callable[[GraphNode], str | None]
+) -> tuple[dict[str, dict[str, GraphNode]], dict[str, GraphNode]]:
+    groups: dict[str, dict[str, GraphNode]] = dict()
+    ungrouped: dict[str, GraphNode] = dict()
+
+    for gn_id, gn in graph_nodes.items():
+        name = key(gn)
+        if name is None:
+            ungrouped[gn_id] = gn
+            continue
+
+        group = groups.get(name)
+        if group is None:
+            group = dict()
+            groups[name] = group
+
+        group[gn_id] = gn
+
+    return groups, ungrouped
+
+
+def label_key(label: str) -> Callable[[GraphNode], str | None]:
+    def key(graph_node: GraphNode) -> str | None:
+        return graph_node.labels.get(label) if graph_node.labels is not None else None
+
+    return key
+
+
+def annotation_key(annotation: str) -> Callable[[GraphNode], str | None]:
+    def key(graph_node: GraphNode) -> str | None:
+        return graph_node.annotations.get(annotation) if graph_node.annotations is not None else None
+
+    return key
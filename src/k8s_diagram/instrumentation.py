@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import wraps
+from typing import Any, Callable, Iterator, Protocol, TextIO
+
+
+@dataclass
+class StageReport:
+    stage: str
+    seconds: float
+    items: int = 0
+    bytes_received: int = 0
+    associations: int = 0
+
+
+class SinkProtocol(Protocol):
+    def emit(self, report: StageReport) -> None: ...
+
+
+class JsonLinesSink:
+    def __init__(self, sink: str | TextIO):
+        self.sink = sink
+
+    def emit(self, report: StageReport) -> None:
+        line = json.dumps(asdict(report)) + "\n"
+
+        if isinstance(self.sink, str):
+            with open(self.sink, "a") as file:
+                file.write(line)
+        else:
+            self.sink.write(line)
+
+
+class PrometheusSink:
+    METRICS = {
+        "seconds": "Wall time of the latest run of the stage in seconds.",
+        "items": "Items produced by the latest run of the stage.",
+        "bytes_received": "API bytes received by the latest run of the stage.",
+        "associations": "Associations made by the latest run of the stage.",
+    }
+
+    def __init__(self, path: str | None = None, prefix: str = "k8s_diagram_stage"):
+        self.path = path
+        self.prefix = prefix
+        self.reports: dict[str, StageReport] = dict()
+
+    def emit(self, report: StageReport) -> None:
+        self.reports[report.stage] = report
+
+        if self.path is not None:
+            with open(self.path, "w") as file:
+                file.write(self.exposition())
+
+    def exposition(self) -> str:
+        lines = []
+        for metric, description in self.METRICS.items():
+            lines.append(f"# HELP {self.prefix}_{metric} {description}")
+            lines.append(f"# TYPE {self.prefix}_{metric} gauge")
+
+            for stage, report in self.reports.items():
+                lines.append(f"{self.prefix}_{metric}{{stage=\"{stage}\"}} {getattr(report, metric)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class Instrumentation:
+    def __init__(self, sinks: list[SinkProtocol] | None = None):
+        self.sinks = sinks if sinks is not None else []
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def attach(self, api_client) -> None:
+        if self.attached(api_client):
+            return
+
+        request = api_client.request
+
+        @wraps(request)
+        def counting_request(*args, **kwargs):
+            response = request(*args, **kwargs)
+            if kwargs.get("_preload_content", True):
+                self.received(len(response.data))
+
+            return response
+
+        counting_request.instrumentation = self
+        api_client.request = counting_request
+
+    def attached(self, api_client) -> bool:
+        request = api_client.request
+        while request is not None:
+            if getattr(request, "instrumentation", None) is self:
+                return True
+
+            request = getattr(request, "__wrapped__", None)
+
+        return False
+
+    @property
+    def current(self) -> StageReport | None:
+        return getattr(self._local, "report", None)
+
+    def received(self, byte_count: int) -> None:
+        report = self.current
+        if report is not None:
+            report.bytes_received += byte_count
+
+    def associated(self, count: int) -> None:
+        report = self.current
+        if report is not None:
+            report.associations += count
+
+    @contextmanager
+    def bind(self, report: StageReport | None) -> Iterator[StageReport | None]:
+        previous = self.current
+        self._local.report = report
+        try:
+            yield report
+        finally:
+            self._local.report = previous
+
+    @contextmanager
+    def stage(self, name: str, reports: list[StageReport] | None = None) -> Iterator[StageReport]:
+        report = StageReport(name, 0.0)
+        previous = self.current
+        self._local.report = report
+
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report.seconds = time.perf_counter() - start
+            self._local.report = previous
+
+            if reports is not None:
+                reports.append(report)
+            self.record(report)
+
+    def record(self, report: StageReport) -> None:
+        with self._lock:
+            for sink in self.sinks:
+                sink.emit(report)
+
+
+def instrumented(items: Callable[[Any], int] | None = None) -> Callable:
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(self, *args, **kwargs):
+            instrumentation: Instrumentation | None = self.instrumentation
+            if instrumentation is None:
+                return function(self, *args, **kwargs)
+
+            with instrumentation.stage(function.__name__, self.reports) as report:
+                result = function(self, *args, **kwargs)
+
+                if items is not None:
+                    report.items = items(self)
+
+            return result
+
+        return wrapper
+
+    return decorator
@@ -1,13 +1,28 @@
-from kubernetes.client import ApiClient, Configuration
+import time
+from typing import TYPE_CHECKING, Iterable
 
+from k8s_diagram.fragments import FragmentCache
+from k8s_diagram.images import ImageBackendProtocol, MermaidInkBackend
+from k8s_diagram.instrumentation import Instrumentation
 from k8s_diagram.parser import Parser
-from k8s_diagram.renderer import DiagramsRenderer, MermaidJSRenderer, RendererProtocol
+from k8s_diagram.renderer import DiagramsRenderer, DotRenderer, MermaidJSRenderer, RendererProtocol, ShardedMermaidJSRenderer
+from k8s_diagram.rollup import LevelOfDetail, rollup
+from k8s_diagram.shards import ShardedGraph
+from k8s_diagram.snapshot import load_snapshot, write_snapshot
 from k8s_diagram.types.base import Graph
+from k8s_diagram.view import View
+
+if TYPE_CHECKING:
+    from kubernetes.client import ApiClient
+
+    from k8s_diagram.neighborhood import Seed
+    from k8s_diagram.watcher import Watcher
 
 
 class FORMATS:
     MERMAID_JS = "mermaid-js"
     DIAGRAMS = "diagrams"
+    DOT = "dot"
 
 
 class K8sDiagrammer:
@@ -18,7 +33,21 @@ class K8sDiagrammer:
         api_key: str,
         cert_path: str | None = None,
         included_namespaces: set[str] = None,
-        excluded_namespaces: set[str] = None
+        excluded_namespaces: set[str] = None,
+        max_workers: int = 1,
+        page_size: int | None = None,
+        raw_json: bool = False,
+        metadata_only: bool = False,
+        image_backend: ImageBackendProtocol | None = None,
+        graph_ttl: float | None = 60.0,
+        instrumentation: Instrumentation | None = None,
+        snapshot_path: str | None = None,
+        uid_prefix: str = "",
+        fragment_cache: FragmentCache | None = None,
+        level_of_detail: LevelOfDetail | None = None,
+        dot_engine: str = "dot",
+        view: View | None = None,
+        annotation_keys: set[str] | None = None
     ):
         self.diagram_format = diagram_format
         self.end_point = end_point
@@ -26,8 +55,36 @@ class K8sDiagrammer:
         self.cert_path = cert_path
         self.included_namespaces = included_namespaces
         self.excluded_namespaces = excluded_namespaces
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.raw_json = raw_json
+        self.metadata_only = metadata_only
+        self.image_backend = image_backend if image_backend is not None else MermaidInkBackend()
+        self.graph_ttl = graph_ttl
+        self.instrumentation = instrumentation
+        self.snapshot_path = snapshot_path
+        self.uid_prefix = uid_prefix
+        self.fragment_cache = fragment_cache
+        self.level_of_detail = level_of_detail
+        self.dot_engine = dot_engine
+        self.view = view
+        self.annotation_keys = annotation_keys
+        self.watcher: "Watcher | None" = None
+
+        self._api_client: "ApiClient | None" = None
+        self._parser: Parser | None = None
+        self._graph: Graph | None = None
+        self._graph_scraped_at: float | None = None
+
+    def api_client(self) -> "ApiClient":
+        if self._api_client is None:
+            self._api_client = self.new_api_client()
+
+        return self._api_client
+
+    def new_api_client(self) -> "ApiClient":
+        from kubernetes.client import ApiClient, Configuration
 
-    def api_client(self) -> ApiClient:
         configuration = Configuration(
             host=self.end_point,
             api_key={"authorization": self.api_key},
@@ -37,21 +94,123 @@ class K8sDiagrammer:
         if self.cert_path is not None:
             configuration.ssl_ca_cert = self.cert_path
 
+        if self.max_workers > configuration.connection_pool_maxsize:
+            configuration.connection_pool_maxsize = self.max_workers
+
         return ApiClient(configuration=configuration)
 
     def parser(self) -> Parser:
-        return Parser(api_client=self.api_client())
+        return Parser(
+            api_client=self.api_client(),
+            page_size=self.page_size,
+            raw_json=self.raw_json,
+            metadata_only=self.metadata_only,
+            instrumentation=self.instrumentation,
+            included_namespaces=self.included_namespaces,
+            excluded_namespaces=self.excluded_namespaces,
+            max_workers=self.max_workers,
+            uid_prefix=self.uid_prefix,
+            fragment_cache=self.fragment_cache,
+            view=self.view,
+            annotation_keys=self.annotation_keys,
+        )
+
+    def watch(self, timeout_seconds: int = 300) -> "Watcher":
+        from k8s_diagram.watcher import Watcher
+
+        if self.watcher is None:
+            self.watcher = Watcher(self.parser(), timeout_seconds=timeout_seconds).start(max_workers=self.max_workers)
+
+        return self.watcher
+
+    def stop_watching(self) -> None:
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
 
     def graph(self) -> Graph:
-        return self.parser().parse(included_namespaces=self.included_namespaces, excluded_namespaces=self.excluded_namespaces)
+        if self.watcher is not None:
+            return self.watcher.graph(
+                included_namespaces=self.included_namespaces,
+                excluded_namespaces=self.excluded_namespaces,
+            )
+
+        if self.snapshot_path is not None:
+            if self._graph is None:
+                self._parser = load_snapshot(
+                    self.snapshot_path,
+                    included_namespaces=self.included_namespaces,
+                    excluded_namespaces=self.excluded_namespaces,
+                    fragment_cache=self.fragment_cache,
+                )
+                self._graph = self._parser.graph()
+
+            return self._graph
 
-    def renderer(self) -> RendererProtocol:
-        match self.diagram_format:
+        if self._graph is None or self.graph_expired():
+            self._parser = self.parser()
+            self._graph = self._parser.parse()
+            self._graph_scraped_at = time.monotonic()
+
+        return self._graph
+
+    def neighborhood(self, seeds: Iterable["Seed"], hops: int = 1) -> Graph:
+        return self.graph().neighborhood(seeds, hops=hops)
+
+    def save_snapshot(self, path: str) -> None:
+        if self.watcher is not None:
+            with self.watcher.lock:
+                write_snapshot(self.watcher.parser, path)
+
+            return
+
+        self.graph()
+        write_snapshot(self._parser, path)
+
+    def graph_expired(self) -> bool:
+        if self._graph_scraped_at is None:
+            return True
+
+        return self.graph_ttl is not None and time.monotonic() - self._graph_scraped_at >= self.graph_ttl
+
+    def invalidate(self) -> None:
+        self._parser = None
+        self._graph = None
+        self._graph_scraped_at = None
+
+    def rendered_graph(self) -> Graph:
+        graph = self.graph()
+        if self.level_of_detail is not None:
+            graph = rollup(graph, self.level_of_detail)
+
+        return graph
+
+    def renderer(self, diagram_format: str | None = None) -> RendererProtocol:
+        match diagram_format or self.diagram_format:
             case FORMATS.MERMAID_JS:
-                return MermaidJSRenderer(self.graph())
+                return MermaidJSRenderer(
+                    self.rendered_graph(),
+                    image_backend=self.image_backend,
+                    instrumentation=self.instrumentation,
+                )
             case FORMATS.DIAGRAMS:
-                return DiagramsRenderer(self.graph())
+                return DiagramsRenderer(self.rendered_graph(), instrumentation=self.instrumentation)
+            case FORMATS.DOT:
+                return DotRenderer(self.rendered_graph(), engine=self.dot_engine, instrumentation=self.instrumentation)
+
+    def sharded_renderer(
+        self,
+        max_nodes: int = 300,
+        max_edges: int | None = None,
+        max_workers: int = 4
+    ) -> ShardedMermaidJSRenderer:
+        return ShardedMermaidJSRenderer(
+            ShardedGraph(self.rendered_graph(), max_nodes=max_nodes, max_edges=max_edges),
+            image_backend=self.image_backend,
+            max_workers=max_workers,
+            instrumentation=self.instrumentation,
+        )
 
-    def render(self) -> None:
-        self.renderer().render()
+    def render(self, diagram_format: str | None = None) -> None:
+        self.renderer(diagram_format).render()
 
@@ -0,0 +1,127 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from k8s_diagram.images import ImageBackendProtocol, MermaidInkBackend
+from k8s_diagram.instrumentation import Instrumentation
+from k8s_diagram.main import FORMATS, K8sDiagrammer
+from k8s_diagram.renderer import DiagramsRenderer, DotRenderer, MermaidJSRenderer, RendererProtocol
+from k8s_diagram.rollup import LevelOfDetail, rollup
+from k8s_diagram.types.base import Graph
+from k8s_diagram.types.kubernetes import Cluster
+
+
+@dataclass
+class ClusterConfig:
+    name: str
+    end_point: str
+    api_key: str
+    cert_path: str | None = None
+    included_namespaces: set[str] | None = None
+    excluded_namespaces: set[str] | None = None
+
+
+@dataclass
+class ClusterResult:
+    config: ClusterConfig
+    seconds: float
+    graph: Graph | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MultiClusterDiagrammer:
+    def __init__(
+        self,
+        clusters: list[ClusterConfig],
+        diagram_format: str,
+        max_clusters: int = 8,
+        image_backend: ImageBackendProtocol | None = None,
+        instrumentation: Instrumentation | None = None,
+        level_of_detail: LevelOfDetail | None = None,
+        dot_engine: str = "dot",
+        **diagrammer_options
+    ):
+        self.clusters = clusters
+        self.diagram_format = diagram_format
+        self.max_clusters = max_clusters
+        self.image_backend = image_backend if image_backend is not None else MermaidInkBackend()
+        self.instrumentation = instrumentation
+        self.level_of_detail = level_of_detail
+        self.dot_engine = dot_engine
+        self.diagrammers: dict[str, K8sDiagrammer] = {
+            cluster.name: K8sDiagrammer(
+                diagram_format,
+                cluster.end_point,
+                cluster.api_key,
+                cert_path=cluster.cert_path,
+                included_namespaces=cluster.included_namespaces,
+                excluded_namespaces=cluster.excluded_namespaces,
+                image_backend=self.image_backend,
+                instrumentation=instrumentation,
+                level_of_detail=level_of_detail,
+                dot_engine=dot_engine,
+                uid_prefix=f"c{index}_",
+                **diagrammer_options,
+            )
+            for index, cluster in enumerate(clusters)
+        }
+        self.results: list[ClusterResult] | None = None
+
+    def scrape_cluster(self, cluster: ClusterConfig) -> ClusterResult:
+        start = time.perf_counter()
+        try:
+            graph = self.diagrammers[cluster.name].graph()
+        except Exception as e:
+            return ClusterResult(cluster, time.perf_counter() - start, error=e)
+
+        return ClusterResult(cluster, time.perf_counter() - start, graph=graph)
+
+    def scrape(self) -> list[ClusterResult]:
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_clusters, len(self.clusters)))) as executor:
+            self.results = list(executor.map(self.scrape_cluster, self.clusters))
+
+        return self.results
+
+    def graph(self) -> Graph:
+        graph = Graph("k8s clusters", graph_nodes=dict())
+
+        for index, result in enumerate(self.scrape()):
+            if not result.ok:
+                continue
+
+            cluster = Cluster(result.config.name, str(index))
+            cluster.graph_nodes = dict(result.graph.graph_nodes or dict())
+            graph.add_graph_node(cluster)
+
+        return graph
+
+    def renderer(self, diagram_format: str | None = None) -> RendererProtocol:
+        graph = self.graph()
+        if self.level_of_detail is not None:
+            graph = rollup(graph, self.level_of_detail)
+
+        match diagram_format or self.diagram_format:
+            case FORMATS.MERMAID_JS:
+                return MermaidJSRenderer(graph, image_backend=self.image_backend, instrumentation=self.instrumentation)
+            case FORMATS.DIAGRAMS:
+                return DiagramsRenderer(graph, instrumentation=self.instrumentation)
+            case FORMATS.DOT:
+                return DotRenderer(graph, engine=self.dot_engine, instrumentation=self.instrumentation)
+
+    def renderers(self, diagram_format: str | None = None) -> dict[str, RendererProtocol]:
+        return {
+            result.config.name: self.diagrammers[result.config.name].renderer(diagram_format)
+            for result in self.scrape()
+            if result.ok
+        }
+
+    def render(self, diagram_format: str | None = None) -> None:
+        self.renderer(diagram_format).render()
+
+    def render_each(self, diagram_format: str | None = None) -> None:
+        for renderer in self.renderers(diagram_format).values():
+            renderer.render()
@@ -0,0 +1,120 @@
+import copy
+from typing import Iterable
+
+from k8s_diagram.types.base import Graph, GraphNode, SubGraph
+
+Seed = GraphNode | str
+
+
+class NeighborhoodIndex:
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self.graph_nodes: dict[str, GraphNode] = dict()
+        self.names: dict[str, list[GraphNode]] = dict()
+        self.adjacency: dict[str, dict[str, GraphNode]] = dict()
+        self.reverse_adjacency: dict[str, dict[str, GraphNode]] = dict()
+        self.parents: dict[str, SubGraph | None] = dict()
+        self.positions: dict[str, int] = dict()
+
+        self.index_members(graph.graph_nodes or dict(), None)
+
+        for graph_node_id, graph_node in self.graph_nodes.items():
+            if not graph_node.related_nodes:
+                continue
+
+            self.adjacency[graph_node_id] = graph_node.related_nodes
+            for related_node_id in graph_node.related_nodes.keys():
+                reverse = self.reverse_adjacency.get(related_node_id)
+                if reverse is None:
+                    reverse = dict()
+                    self.reverse_adjacency[related_node_id] = reverse
+
+                reverse[graph_node_id] = graph_node
+
+    def index_members(self, graph_nodes: dict[str, GraphNode], parent: SubGraph | None) -> None:
+        for position, (graph_node_id, graph_node) in enumerate(graph_nodes.items()):
+            self.parents[graph_node_id] = parent
+            self.positions[graph_node_id] = position
+
+            if isinstance(graph_node, SubGraph):
+                self.index_members(graph_node.graph_nodes or dict(), graph_node)
+                continue
+
+            self.graph_nodes[graph_node_id] = graph_node
+            self.names.setdefault(f"{graph_node.namespace}/{graph_node.object_name or graph_node.name}", []).append(graph_node)
+
+    def resolve(self, seed: Seed) -> list[GraphNode]:
+        seed_id = seed.id if isinstance(seed, GraphNode) else seed
+
+        graph_node = self.graph_nodes.get(seed_id)
+        if graph_node is not None:
+            return [graph_node]
+
+        if not isinstance(seed, GraphNode) and seed in self.names:
+            return self.names[seed]
+
+        raise KeyError(seed_id)
+
+    def select(self, seeds: Iterable[Seed], hops: int = 1) -> dict[str, GraphNode]:
+        selected: dict[str, GraphNode] = dict()
+        for seed in seeds:
+            for graph_node in self.resolve(seed):
+                selected[graph_node.id] = graph_node
+
+        frontier = list(selected.values())
+        for _ in range(hops):
+            next_frontier = []
+            for graph_node in frontier:
+                for neighbours in (self.adjacency.get(graph_node.id), self.reverse_adjacency.get(graph_node.id)):
+                    for neighbour_id, neighbour in (neighbours or dict()).items():
+                        if neighbour_id not in selected and neighbour_id in self.graph_nodes:
+                            selected[neighbour_id] = neighbour
+                            next_frontier.append(neighbour)
+            frontier = next_frontier
+
+        return selected
+
+    def neighborhood(self, seeds: Iterable[Seed], hops: int = 1) -> Graph:
+        return self.prune(self.select(seeds, hops))
+
+    def prune(self, selected: dict[str, GraphNode]) -> Graph:
+        copies = {graph_node_id: copy.copy(graph_node) for graph_node_id, graph_node in selected.items()}
+        for graph_node_id, graph_node in copies.items():
+            related_nodes = {
+                related_node_id: copies[related_node_id]
+                for related_node_id in (selected[graph_node_id].related_nodes or dict()).keys()
+                if related_node_id in copies
+            }
+            graph_node.related_nodes = related_nodes if related_nodes else None
+
+        subgraphs: dict[str, SubGraph] = dict()
+        members: dict[str | None, list[GraphNode]] = {None: []}
+        for graph_node_id, graph_node in copies.items():
+            member, parent = graph_node, self.parents[graph_node_id]
+            while parent is not None:
+                members.setdefault(parent.id, []).append(member)
+                if parent.id in subgraphs:
+                    break
+
+                subgraph = copy.copy(parent)
+                subgraphs[parent.id] = subgraph
+                member, parent = subgraph, self.parents[parent.id]
+            else:
+                members[None].append(member)
+
+        pruned = copy.copy(self.graph)
+        pruned.neighborhood_index = None
+        pruned.graph_nodes = self.ordered(members[None])
+        for subgraph_id, subgraph in subgraphs.items():
+            subgraph.graph_nodes = self.ordered(members[subgraph_id])
+
+        return pruned
+
+    def ordered(self, graph_nodes: list[GraphNode]) -> dict[str, GraphNode]:
+        graph_nodes.sort(key=lambda graph_node: self.positions[graph_node.id])
+
+        return {graph_node.id: graph_node for graph_node in graph_nodes}
+
+
+def neighborhood(graph: Graph, seeds: Iterable[Seed], hops: int = 1) -> Graph:
+    return graph.neighborhood(seeds, hops=hops)
@@ -1,16 +1,38 @@
+import itertools
+import json
 import pprint
-from dataclasses import dataclass
-from typing import Self
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import cached_property, partial
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Self
+
+from k8s_diagram.fragments import FragmentCache
+from k8s_diagram.index import LabelIndex, OwnerIndex, group_by
+from k8s_diagram.instrumentation import Instrumentation, StageReport, instrumented
+from k8s_diagram.resources import (
+    CRON_JOBS, DEPLOYMENTS, JOBS, NAMESPACES, OWNER_RESOURCES, OWNERSHIPS, PODS, REPLICA_SETS, RESOURCES, SERVICES,
+    STATEFUL_SETS, Resource,
+)
+from k8s_diagram.types.base import Graph, GraphNode, SubGraph, intern_labels
+from k8s_diagram.types.kubernetes import App, CronJob, Deployment, Job, Namespace, Pod, ReplicaSet, Service, StatefulSet, System
+from k8s_diagram.view import FetchPlan, View
 
-from kubernetes.client import ApiClient, AppsV1Api, BatchV1Api, CoreV1Api, CustomObjectsApi
+if TYPE_CHECKING:
+    from kubernetes.client import ApiClient, AppsV1Api, BatchV1Api, CoreV1Api, CustomObjectsApi
 
-from k8s_diagram.types.base import Graph
-from k8s_diagram.types.kubernetes import App, CronJob, Deployment, Job, Namespace, Pod, ReplicaSet, Service, StatefulSet, System
+    from k8s_diagram.neighborhood import Seed
+
+PARTIAL_OBJECT_METADATA_LIST = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json"
+PARTIAL_OBJECT_METADATA = "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,application/json"
 
 
 @dataclass
 class Parser:
-    api_client: ApiClient
+    api_client: "ApiClient"
     namespaces: dict[str, Namespace] | None = None
     services: dict[str, Service] | None = None
     pods: dict[str, Pod] | None = None
@@ -21,51 +43,149 @@ class Parser:
     cron_jobs: dict[str, CronJob] | None = None
     apps: list[App] | None = None
     systems: dict[str, System] | None = None
+    pod_labels: LabelIndex | None = None
+    owners: OwnerIndex | None = None
+    page_size: int | None = None
+    max_list_restarts: int = 3
+    raw_json: bool = False
+    metadata_only: bool = False
+    resource_versions: dict[type[GraphNode], str] = field(default_factory=dict)
+    namespace_resource_versions: dict[tuple[type[GraphNode], str], str] = field(default_factory=dict)
+    instrumentation: Instrumentation | None = None
+    reports: list[StageReport] = field(default_factory=list)
+    included_namespaces: set[str] | None = None
+    excluded_namespaces: set[str] | None = None
+    max_workers: int = 1
+    uid_prefix: str = ""
+    fragment_cache: FragmentCache | None = None
+    view: View | None = None
+    annotation_keys: set[str] | None = None
+    cached_graph: tuple[tuple, Graph] | None = field(default=None, init=False, repr=False)
+    request_slots: threading.BoundedSemaphore | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.instrumentation is not None:
+            self.instrumentation.attach(self.api_client)
+
+    @cached_property
+    def plan(self) -> FetchPlan:
+        return FetchPlan.of(self.view)
+
+    @cached_property
+    def core_v1_api(self) -> "CoreV1Api":
+        from kubernetes.client import CoreV1Api
 
-    @property
-    def core_v1_api(self) -> CoreV1Api:
         return CoreV1Api(api_client=self.api_client)
 
-    @property
-    def apps_v1_api(self) -> AppsV1Api:
+    @cached_property
+    def apps_v1_api(self) -> "AppsV1Api":
+        from kubernetes.client import AppsV1Api
+
         return AppsV1Api(api_client=self.api_client)
 
-    @property
-    def custom_object_api(self) -> CustomObjectsApi:
+    @cached_property
+    def custom_object_api(self) -> "CustomObjectsApi":
+        from kubernetes.client import CustomObjectsApi
+
         return CustomObjectsApi(api_client=self.api_client)
 
-    @property
-    def batch_v1_api(self) -> BatchV1Api:
+    @cached_property
+    def batch_v1_api(self) -> "BatchV1Api":
+        from kubernetes.client import BatchV1Api
+
         return BatchV1Api(api_client=self.api_client)
 
-    def parse(self, included_namespaces: set[str] = None, excluded_namespaces: set[str] = None) -> Graph:
-        graph = Graph("k8s cluster")
-
-        (
-            self.parse_namespaces()
-            .parse_services()
-            .parse_pods()
-            .parse_deployments()
-            .parse_replica_sets()
-            .parse_stateful_sets()
-            .parse_jobs()
-            .parse_cron_jobs()
+    def parse(
+        self,
+        included_namespaces: set[str] = None,
+        excluded_namespaces: set[str] = None,
+        max_workers: int | None = None
+    ) -> Graph:
+        if included_namespaces is not None:
+            self.included_namespaces = included_namespaces
+        if excluded_namespaces is not None:
+            self.excluded_namespaces = excluded_namespaces
+
+        return (
+            self.fetch(max_workers=max_workers)
+            .associate()
+            .organize()
+            .graph()
+        )
+
+    def fetch(self, max_workers: int | None = None) -> Self:
+        if max_workers is not None:
+            self.max_workers = max_workers
+
+        self.reports = []
+        self.invalidate_graph()
+        self.request_slots = threading.BoundedSemaphore(max(1, self.max_workers))
+
+        for resource in RESOURCES:
+            if resource not in self.plan.resources:
+                setattr(self, resource.attribute, dict())
+
+        stages = [partial(self.parse_resource, resource) for resource in self.plan.resources]
+
+        if self.max_workers <= 1:
+            for stage in stages:
+                stage()
+
+            return self
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(stage) for stage in stages]
+
+            for future in futures:
+                future.result()
+
+        return self
+
+    def associate(self) -> Self:
+        self.invalidate_graph()
+
+        if self.view is not None:
+            for stage in self.plan.associate_stages:
+                getattr(self, stage)()
+
+            return self
+
+        return (
+            self.index_pod_labels()
+            .index_owners()
             .associate_services_with_namespaces()
             .associate_pods_with_namespaces()
             .associate_pods_with_services()
             .associate_deployments_with_namespaces()
             .associate_replica_sets_with_namespaces()
-            .associate_replica_sets_with_deployments()
-            .associate_pods_with_replica_sets()
             .associate_stateful_sets_with_namespaces()
             .associate_pods_with_stateful_sets()
             .associate_jobs_with_namespaces()
-            .associate_pods_with_jobs()
             .associate_cron_jobs_with_namespaces()
-            .associate_jobs_with_cron_jobs()
-            .organize_into_systems()
-            .organize_into_apps()
+            .associate_owners()
+        )
+
+    def organize(self) -> Self:
+        self.invalidate_graph()
+
+        return self.organize_into_systems().organize_into_apps()
+
+    def invalidate_graph(self) -> None:
+        self.cached_graph = None
+
+    def graph(self, included_namespaces: set[str] = None, excluded_namespaces: set[str] = None) -> Graph:
+        if included_namespaces is None and excluded_namespaces is None:
+            included_namespaces = self.included_namespaces
+            excluded_namespaces = self.excluded_namespaces
+
+        key = (
+            frozenset(included_namespaces) if included_namespaces is not None else None,
+            frozenset(excluded_namespaces) if excluded_namespaces is not None else None,
         )
+        if self.cached_graph is not None and self.cached_graph[0] == key:
+            return self.cached_graph[1]
+
+        graph = Graph("k8s cluster", fragment_cache=self.fragment_cache)
 
         if included_namespaces is not None:
             graph.add_graph_nodes(
@@ -86,252 +206,516 @@ class Parser:
         else:
             graph.add_graph_nodes(self.namespaces)
 
+        if self.instrumentation is not None:
+            graph.report = list(self.reports)
+
+        self.cached_graph = (key, graph)
+
         return graph
 
+    def neighborhood(self, seeds: Iterable["Seed"], hops: int = 1) -> Graph:
+        return self.graph().neighborhood(seeds, hops=hops)
+
     def parse_namespaces(self) -> Self:
-        self.namespaces = dict()
+        return self.parse_resource(NAMESPACES)
 
-        count = 1
-        for v1_namespace in self.core_v1_api.list_namespace().items:
-            namespace = Namespace.from_object(v1_namespace, str(count))
-            self.namespaces[namespace.name] = namespace
+    def parse_services(self) -> Self:
+        return self.parse_resource(SERVICES)
 
-            count += 1
+    def parse_pods(self) -> Self:
+        return self.parse_resource(PODS)
 
-        return self
+    def parse_deployments(self) -> Self:
+        return self.parse_resource(DEPLOYMENTS)
 
-    def parse_services(self) -> Self:
-        self.services = dict()
+    def parse_replica_sets(self) -> Self:
+        return self.parse_resource(REPLICA_SETS)
 
-        count = 1
+    def parse_stateful_sets(self) -> Self:
+        return self.parse_resource(STATEFUL_SETS)
 
-        for v1_service in self.core_v1_api.list_service_for_all_namespaces().items:
-            service = Service.from_object(v1_service, str(count))
-            self.services[service.name] = service
-            count += 1
+    def parse_jobs(self) -> Self:
+        return self.parse_resource(JOBS)
 
-        return self
+    def parse_cron_jobs(self) -> Self:
+        return self.parse_resource(CRON_JOBS)
 
-    def parse_pods(self) -> Self:
-        self.pods = dict()
+    def parse_resource(self, resource: Resource) -> Self:
+        self.invalidate_graph()
 
-        count = 1
+        if self.instrumentation is None:
+            setattr(self, resource.attribute, self._list_graph_nodes(resource))
 
-        for v1_pod in self.core_v1_api.list_pod_for_all_namespaces().items:
-            pod = Pod.from_object(v1_pod, str(count))
-            self.pods[pod.uid] = pod
-            count += 1
+            return self
+
+        with self.instrumentation.stage(f"parse_{resource.attribute}", self.reports) as report:
+            setattr(self, resource.attribute, self._list_graph_nodes(resource))
+            report.items = len(getattr(self, resource.attribute))
 
         return self
 
-    def parse_deployments(self) -> Self:
-        self.deployments = dict()
+    def list_function(self, resource: Resource) -> Callable:
+        return getattr(getattr(self, resource.api), resource.list_function)
 
-        count = 1
+    def namespaced_list_function(self, resource: Resource, namespace: str) -> Callable:
+        return partial(getattr(getattr(self, resource.api), resource.namespaced_list_function), namespace)
 
-        for v1_deployment in self.apps_v1_api.list_deployment_for_all_namespaces().items:
-            deployment = Deployment.from_object(v1_deployment, str(count))
-            self.deployments[deployment.name] = deployment
-            count += 1
+    def field_selector(self, resource: Resource) -> str | None:
+        if self.included_namespaces is not None or not self.excluded_namespaces:
+            return None
 
-        return self
+        field = "metadata.namespace" if resource.namespaced else "metadata.name"
 
-    def parse_replica_sets(self) -> Self:
-        self.replica_sets = dict()
+        return ",".join(f"{field}!={namespace}" for namespace in sorted(self.excluded_namespaces))
 
-        count = 1
+    def fetches_metadata_only(self, resource: Resource) -> bool:
+        if resource.metadata_path is None:
+            return False
 
-        for v1_replica_set in self.apps_v1_api.list_replica_set_for_all_namespaces().items:
-            replica_set = ReplicaSet.from_object(v1_replica_set, str(count))
-            self.replica_sets[replica_set.name] = replica_set
-            count += 1
+        return self.metadata_only or resource in self.plan.metadata_only
 
-        return self
+    def watch_function(self, resource: Resource, namespace: str | None = None) -> Callable:
+        field_selector = self.field_selector(resource) if namespace is None else None
 
-    def parse_stateful_sets(self) -> Self:
-        self.stateful_sets = dict()
+        if self.fetches_metadata_only(resource):
+            path = resource.metadata_path if namespace is None else resource.namespaced_metadata_path(namespace)
 
-        count = 1
+            return partial(self._watch_metadata, path, field_selector=field_selector)
 
-        for v1_stateful_set in self.apps_v1_api.list_stateful_set_for_all_namespaces().items:
-            stateful_set = StatefulSet.from_object(v1_stateful_set, str(count))
-            self.stateful_sets[stateful_set.name] = stateful_set
-            count += 1
+        if namespace is None:
+            list_function = self.list_function(resource)
+        else:
+            list_function = self.namespaced_list_function(resource, namespace)
+
+        if field_selector is None:
+            return partial(list_function)
+
+        return partial(list_function, field_selector=field_selector)
+
+    def _watch_metadata(
+        self,
+        path: str,
+        field_selector: str | None = None,
+        watch: bool = True,
+        resource_version: str | None = None,
+        allow_watch_bookmarks: bool | None = None,
+        timeout_seconds: int | None = None,
+        _preload_content: bool = False
+    ):
+        query_params = [("watch", watch)]
+        if field_selector is not None:
+            query_params.append(("fieldSelector", field_selector))
+        if resource_version is not None:
+            query_params.append(("resourceVersion", resource_version))
+        if allow_watch_bookmarks is not None:
+            query_params.append(("allowWatchBookmarks", allow_watch_bookmarks))
+        if timeout_seconds is not None:
+            query_params.append(("timeoutSeconds", timeout_seconds))
+
+        return self.api_client.call_api(
+            path,
+            "GET",
+            query_params=query_params,
+            header_params={"Accept": PARTIAL_OBJECT_METADATA},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=_preload_content,
+        )
 
-        return self
+    def _list_model_page(self, list_function: Callable, **kwargs) -> tuple[list, str | None, str | None]:
+        page = list_function(**kwargs)
+
+        return page.items, page.metadata._continue, page.metadata.resource_version
+
+    def _list_raw_page(self, list_function: Callable, **kwargs) -> tuple[list, str | None, str | None]:
+        return self._decode_page(list_function(_preload_content=False, **kwargs))
+
+    def _list_metadata_page(
+        self,
+        path: str,
+        limit: int | None = None,
+        _continue: str | None = None,
+        field_selector: str | None = None
+    ) -> tuple[list, str | None, str | None]:
+        query_params = []
+        if field_selector is not None:
+            query_params.append(("fieldSelector", field_selector))
+        if limit is not None:
+            query_params.append(("limit", limit))
+        if _continue is not None:
+            query_params.append(("continue", _continue))
+
+        response = self.api_client.call_api(
+            path,
+            "GET",
+            query_params=query_params,
+            header_params={"Accept": PARTIAL_OBJECT_METADATA_LIST},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+        )
 
-    def parse_jobs(self) -> Self:
-        self.jobs = dict()
+        return self._decode_page(response)
 
-        count = 1
+    def _decode_page(self, response) -> tuple[list, str | None, str | None]:
+        try:
+            data = response.data
+        finally:
+            response.release_conn()
 
-        for v1_job in self.batch_v1_api.list_job_for_all_namespaces().items:
-            job = Job.from_object(v1_job, str(count))
-            self.jobs[job.name] = job
-            count += 1
+        if self.instrumentation is not None:
+            self.instrumentation.received(len(data))
 
-        return self
+        page = json.loads(data)
 
-    def parse_cron_jobs(self) -> Self:
-        self.cron_jobs = dict()
+        metadata = page["metadata"]
+
+        return page.get("items") or [], metadata.get("continue"), metadata.get("resourceVersion")
+
+    def _list_page_function(self, resource: Resource, namespace: str | None = None) -> Callable:
+        if namespace is not None:
+            if self.fetches_metadata_only(resource):
+                return partial(self._list_metadata_page, resource.namespaced_metadata_path(namespace))
+            if self.raw_json:
+                return partial(self._list_raw_page, self.namespaced_list_function(resource, namespace))
+
+            return partial(self._list_model_page, self.namespaced_list_function(resource, namespace))
+
+        field_selector = self.field_selector(resource)
+        if self.fetches_metadata_only(resource):
+            return partial(self._list_metadata_page, resource.metadata_path, field_selector=field_selector)
+        if self.raw_json:
+            return partial(self._list_raw_page, self.list_function(resource), field_selector=field_selector)
+
+        return partial(self._list_model_page, self.list_function(resource), field_selector=field_selector)
+
+    def _list_resource_items(self, resource: Resource) -> Iterator:
+        if self.included_namespaces is None or not resource.namespaced:
+            yield from self._list_items(resource, self._list_page_function(resource))
+
+            return
+
+        yield from self._list_namespaced_items(resource, sorted(self.included_namespaces))
+
+    def _list_namespaced_items(self, resource: Resource, namespaces: list[str]) -> Iterator:
+        report = self.instrumentation.current if self.instrumentation is not None else None
 
-        count = 1
+        def list_page(namespace: str, _continue: str | None = None) -> tuple[list, str | None, str | None]:
+            kwargs = dict() if self.page_size is None else dict(limit=self.page_size, _continue=_continue)
 
-        for v1_cron_job in self.batch_v1_api.list_cron_job_for_all_namespaces().items:
-            cron_job = CronJob.from_object(v1_cron_job, str(count))
-            self.cron_jobs[cron_job.name] = cron_job
-            count += 1
+            with self.instrumentation.bind(report) if self.instrumentation is not None else nullcontext():
+                return self._request_page(self._list_page_function(resource, namespace), **kwargs)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            remaining = iter(namespaces)
+            in_flight = deque(
+                (namespace, executor.submit(list_page, namespace))
+                for namespace in itertools.islice(remaining, self.max_workers)
+            )
+
+            while in_flight:
+                namespace, future = in_flight.popleft()
+                items, _continue, resource_version = future.result()
+                self.resource_versions[resource.graph_node_type] = resource_version
+                self.namespace_resource_versions[(resource.graph_node_type, namespace)] = resource_version
+
+                if _continue and self.page_size is not None:
+                    in_flight.appendleft((namespace, executor.submit(list_page, namespace, _continue)))
+                else:
+                    for namespace in itertools.islice(remaining, 1):
+                        in_flight.append((namespace, executor.submit(list_page, namespace)))
+
+                yield from items
+                del items
+
+    def _request_page(self, list_page: Callable[..., tuple[list, str | None, str | None]], **kwargs) -> tuple[list, str | None, str | None]:
+        with self.request_slots if self.request_slots is not None else nullcontext():
+            return list_page(**kwargs)
+
+    def resource_version(self, resource: Resource, namespace: str | None = None) -> str | None:
+        if namespace is not None:
+            resource_version = self.namespace_resource_versions.get((resource.graph_node_type, namespace))
+            if resource_version is not None:
+                return resource_version
+
+        return self.resource_versions.get(resource.graph_node_type)
+
+    def _list_items(self, resource: Resource, list_page: Callable[..., tuple[list, str | None, str | None]]) -> Iterator:
+        if self.page_size is None:
+            items, _, self.resource_versions[resource.graph_node_type] = self._request_page(list_page)
+            yield from items
+
+            return
+
+        _continue = None
+        while True:
+            items, _continue, self.resource_versions[resource.graph_node_type] = self._request_page(
+                list_page,
+                limit=self.page_size,
+                _continue=_continue
+            )
+
+            yield from items
+            del items
+
+            if not _continue:
+                return
+
+    def _list_graph_nodes(self, resource: Resource) -> dict[str, GraphNode]:
+        from kubernetes.client import ApiException
+
+        graph_node_type = resource.graph_node_type
+
+        if self.raw_json or (self.fetches_metadata_only(resource)):
+            from_item = graph_node_type.from_dict
+        else:
+            from_item = graph_node_type.from_object
+
+        restarts = 0
+        while True:
+            graph_nodes = dict()
+
+            count = 1
+            try:
+                for item in self._list_resource_items(resource):
+                    graph_node = self.annotate(from_item(item, f"{self.uid_prefix}{count}"), item)
+                    if resource is NAMESPACES and not self.includes_namespace(graph_node.name):
+                        continue
+
+                    graph_nodes[resource.key(graph_node)] = graph_node
+                    count += 1
+
+                return graph_nodes
+            except ApiException as e:
+                if e.status != 410 or restarts >= self.max_list_restarts:
+                    raise
+
+                restarts += 1
+
+    def associated(self, count: int) -> None:
+        if self.instrumentation is not None:
+            self.instrumentation.associated(count)
+
+    def annotate(self, graph_node: GraphNode, item) -> GraphNode:
+        if not self.annotation_keys:
+            return graph_node
+
+        if isinstance(item, dict):
+            annotations = item["metadata"].get("annotations")
+        else:
+            annotations = item.metadata.annotations
+
+        if annotations:
+            graph_node.annotations = intern_labels(
+                {key: value for key, value in annotations.items() if key in self.annotation_keys}
+            )
+
+        return graph_node
+
+    def includes_namespace(self, namespace_name: str) -> bool:
+        if self.included_namespaces is not None:
+            return namespace_name in self.included_namespaces
+        if self.excluded_namespaces is not None:
+            return namespace_name not in self.excluded_namespaces
+
+        return True
+
+    @instrumented(items=lambda parser: len(parser.pod_labels.buckets))
+    def index_pod_labels(self) -> Self:
+        self.pod_labels = LabelIndex()
+
+        for pod in self.pods.values():
+            self.pod_labels.add(pod, pod.labels)
+
+        return self
+
+    @instrumented(items=lambda parser: len(parser.owners))
+    def index_owners(self) -> Self:
+        self.owners = OwnerIndex()
+
+        for resource in OWNER_RESOURCES:
+            self.owners.add(getattr(self, resource.attribute).values())
 
         return self
 
+    @instrumented()
     def associate_services_with_namespaces(self) -> Self:
         for service in self.services.values():
             namespace = self.namespaces[service.namespace]
             namespace.add_graph_node(service)
 
+        self.associated(len(self.services))
+
         return self
 
+    @instrumented()
     def associate_pods_with_namespaces(self) -> Self:
         for pod in self.pods.values():
             namespace = self.namespaces[pod.namespace]
             namespace.add_graph_node(pod)
 
+        self.associated(len(self.pods))
+
         return self
 
+    @instrumented()
     def associate_pods_with_services(self) -> Self:
+        count = 0
         for service in self.services.values():
-            if service.selectors is not None:
-                for pod in self.pods.values():
-                    has_labels = True
-                    for key, value in service.selectors.items():
-                        has_labels = has_labels and (key in pod.labels and pod.labels[key] == value)
+            for pod in self.pod_labels.select(service.namespace, service.selectors):
+                service.add_related_node(pod)
+                count += 1
 
-                    if has_labels:
-                        service.add_related_node(pod)
+        self.associated(count)
 
         return self
 
+    @instrumented()
     def associate_deployments_with_namespaces(self) -> Self:
         for deployment in self.deployments.values():
             namespace = self.namespaces[deployment.namespace]
             namespace.add_graph_node(deployment)
 
+        self.associated(len(self.deployments))
+
         return self
 
+    @instrumented()
     def associate_replica_sets_with_namespaces(self) -> Self:
         for replica_set in self.replica_sets.values():
             namespace = self.namespaces[replica_set.namespace]
             namespace.add_graph_node(replica_set)
 
-        return self
-
-    def associate_replica_sets_with_deployments(self) -> Self:
-        for replica_set in self.replica_sets.values():
-            deployment = self.deployments[replica_set.deployment_name]
-            deployment.add_related_node(replica_set)
-
-        return self
-
-    def associate_pods_with_replica_sets(self) -> Self:
-        for pod in self.pods.values():
-            if pod.replica_set_name in self.replica_sets:
-                replica_set = self.replica_sets[pod.replica_set_name]
-                replica_set.add_related_node(pod)
+        self.associated(len(self.replica_sets))
 
         return self
 
+    @instrumented()
     def associate_stateful_sets_with_namespaces(self) -> Self:
         for stateful_set in self.stateful_sets.values():
             namespace = self.namespaces[stateful_set.namespace]
             namespace.add_graph_node(stateful_set)
 
+        self.associated(len(self.stateful_sets))
+
         return self
 
+    @instrumented()
     def associate_pods_with_stateful_sets(self) -> Self:
+        count = 0
         for stateful_set in self.stateful_sets.values():
-            if stateful_set.selectors is not None:
-                for pod in self.pods.values():
-                    has_labels = True
-                    for key, value in stateful_set.selectors.items():
-                        has_labels = has_labels and (key in pod.labels and pod.labels[key] == value)
+            for pod in self.pod_labels.select(stateful_set.namespace, stateful_set.selectors):
+                stateful_set.add_related_node(pod)
+                count += 1
 
-                    if has_labels:
-                        stateful_set.add_related_node(pod)
+        self.associated(count)
 
         return self
 
+    @instrumented()
     def associate_jobs_with_namespaces(self) -> Self:
         for job in self.jobs.values():
             namespace = self.namespaces[job.namespace]
             namespace.add_graph_node(job)
 
-        return self
-
-    def associate_pods_with_jobs(self) -> Self:
-        for pod in self.pods.values():
-            if pod.job_name in self.jobs:
-                job = self.jobs[pod.job_name]
-                job.add_related_node(pod)
+        self.associated(len(self.jobs))
 
         return self
 
+    @instrumented()
     def associate_cron_jobs_with_namespaces(self) -> Self:
         for cron_job in self.cron_jobs.values():
             namespace = self.namespaces[cron_job.namespace]
             namespace.add_graph_node(cron_job)
 
+        self.associated(len(self.cron_jobs))
+
         return self
 
-    def associate_jobs_with_cron_jobs(self) -> Self:
-        for job in self.jobs.values():
-            if job.cron_job_name in self.cron_jobs:
-                cron_job = self.cron_jobs[job.cron_job_name]
-                cron_job.add_related_node(job)
+    @instrumented()
+    def associate_owners(self) -> Self:
+        count = 0
+        for resource, owner_resources in OWNERSHIPS:
+            owner_types = [owner_resource.graph_node_type for owner_resource in owner_resources]
+
+            for graph_node in getattr(self, resource.attribute).values():
+                owner = self.owners.owner(graph_node, owner_types)
+                if owner is not None:
+                    owner.add_related_node(graph_node)
+                    count += 1
+
+        self.associated(count)
+
+        return self
+
+    @instrumented()
+    def associate_view(self) -> Self:
+        reverse: dict[str, list[GraphNode]] = dict()
+        for resource in self.plan.resources:
+            for graph_node in getattr(self, resource.attribute).values():
+                for related_node_id in (graph_node.related_nodes or dict()).keys():
+                    reverse.setdefault(related_node_id, []).append(graph_node)
+
+        related: dict[str, dict[str, GraphNode]] = dict()
+        for link in self.plan.links:
+            for holder in getattr(self, link.holder.attribute).values():
+                graph_nodes = [holder]
+                for step in link.steps:
+                    graph_nodes = step.follow(graph_nodes, reverse)
+
+                if graph_nodes:
+                    related.setdefault(holder.id, dict()).update((gn.id, gn) for gn in graph_nodes)
+
+        for resource in self.plan.shown:
+            for graph_node in getattr(self, resource.attribute).values():
+                graph_node.related_nodes = related.get(graph_node.id)
+
+        self.associated(sum(map(len, related.values())))
 
         return self
 
+    @instrumented(items=lambda parser: len(parser.systems))
     def organize_into_systems(self) -> Self:
         if self.systems is None:
             self.systems = dict()
 
-        for namespace in self.namespaces.values():
-            if namespace.graph_nodes is not None:
-                system_names = {gn.system for gn in namespace.graph_nodes.values() if gn.system is not None}
+        for system in self.organize_into(self.namespaces.values(), attrgetter("system"), System):
+            self.systems[system.id] = system
 
-                count = 1
-                for system_name in system_names:
-                    uid = f"{namespace.id}_{count}"
-                    system = System(system_name, uid)
-                    system_graph_nodes = {gn_id: gn for gn_id, gn in namespace.graph_nodes.items() if gn.system == system_name}
-                    system.graph_nodes = system_graph_nodes
-
-                    self.systems[system.id] = system
+        return self
 
-                    namespace.add_graph_node(system)
-                    namespace.remove_graph_nodes(system_graph_nodes)
+    @instrumented(items=lambda parser: len(parser.apps))
+    def organize_into_apps(self) -> Self:
+        if self.apps is None:
+            self.apps = list()
 
-                    count += 1
+        clusters = itertools.chain(self.systems.values(), self.namespaces.values())
+        self.apps.extend(self.organize_into(clusters, attrgetter("app"), App))
 
         return self
 
-    def organize_into_apps(self) -> Self:
-        buckets = [self.systems.values(), self.namespaces.values()]
+    def organize_into(
+        self,
+        clusters: Iterable[SubGraph],
+        key: Callable[[GraphNode], str | None],
+        subgraph_type: Callable[[str, str], SubGraph]
+    ) -> list[SubGraph]:
+        subgraphs = []
 
-        for bucket in buckets:
-            for cluster in bucket:
-                if cluster.graph_nodes is not None:
-                    app_names = {gn.app for gn in cluster.graph_nodes.values() if gn.app is not None}
+        for cluster in clusters:
+            if cluster.graph_nodes is None:
+                continue
 
-                    count = 1
-                    for app_name in app_names:
-                        uid = f"{cluster.id}_{count}"
-                        app = App(app_name, uid)
-                        app_graph_nodes = {gn_id: gn for gn_id, gn in cluster.graph_nodes.items() if gn.app == app_name}
-                        app.graph_nodes = app_graph_nodes
+            groups, ungrouped = group_by(cluster.graph_nodes, key)
+            if not groups:
+                continue
 
-                        cluster.add_graph_node(app)
-                        cluster.remove_graph_nodes(app_graph_nodes)
+            cluster.graph_nodes = ungrouped
+            for count, (name, graph_nodes) in enumerate(groups.items(), start=1):
+                subgraph = subgraph_type(name, f"{cluster.id}_{count}")
+                subgraph.graph_nodes = graph_nodes
 
-                        count += 1
+                cluster.add_graph_node(subgraph)
+                subgraphs.append(subgraph)
 
-        return self
+        return subgraphs
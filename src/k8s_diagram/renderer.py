@@ -1,11 +1,13 @@
-import base64
 import io
-from typing import Protocol
-
-import requests
-from PIL import Image
-from matplotlib import pyplot as plt
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from typing import BinaryIO, Iterator, Protocol, TextIO
 
+from k8s_diagram.images import ImageBackendProtocol, MermaidInkBackend
+from k8s_diagram.instrumentation import Instrumentation, StageReport
+from k8s_diagram.shards import INDEX_NAME, ShardedGraph
 from k8s_diagram.types.base import Graph
 
 
@@ -14,29 +16,156 @@ class RendererProtocol(Protocol):
 
 
 class BaseRenderer:
-    def __init__(self, graph: Graph):
+    def __init__(self, graph: Graph, instrumentation: Instrumentation | None = None):
         self.graph = graph
+        self.instrumentation = instrumentation
+
+    def stage(self, name: str) -> AbstractContextManager[StageReport | None]:
+        if self.instrumentation is None:
+            return nullcontext()
+
+        return self.instrumentation.stage(f"{type(self).__name__}.{name}")
 
 
 class MermaidJSRenderer(BaseRenderer):
+    def __init__(
+        self,
+        graph: Graph,
+        image_backend: ImageBackendProtocol | None = None,
+        instrumentation: Instrumentation | None = None
+    ):
+        super().__init__(graph, instrumentation=instrumentation)
+
+        self.image_backend = image_backend if image_backend is not None else MermaidInkBackend()
+
     @property
     def graph_code(self) -> str:
-        return self.graph.to_mermaid_js_code()
+        return "".join(self.iter_graph_code())
 
-    def render(self):
-        graphbytes = self.graph_code.encode("ascii")
+    def iter_graph_code(self) -> Iterator[str]:
+        return self.graph.iter_mermaid_js_code()
+
+    def write(self, sink: str | TextIO) -> None:
+        if isinstance(sink, str):
+            with open(sink, "w") as file:
+                self.graph.write_mermaid_js_code(file)
+        else:
+            self.graph.write_mermaid_js_code(sink)
+
+    def render(self, output: str | BinaryIO | None = None):
+        with self.stage("render") as report:
+            content = self.image_backend.fetch(self.graph_code)
+
+            if report is not None:
+                report.bytes_received = len(content)
 
-        base64_bytes = base64.b64encode(graphbytes)
-        base64_string = base64_bytes.decode("ascii")
+        if output is not None:
+            if isinstance(output, str):
+                with open(output, "wb") as file:
+                    file.write(content)
+            else:
+                output.write(content)
 
-        path = f"https://mermaid.ink/img/{base64_string}"
-        content = requests.get(path).content
-        image_bytes = io.BytesIO(content)
-        img = Image.open(image_bytes)
-        plt.imshow(img)
+            return
+
+        from PIL import Image
+        from matplotlib import pyplot as plt
+
+        plt.imshow(Image.open(io.BytesIO(content)))
         plt.show()
 
 
+class ShardedMermaidJSRenderer(BaseRenderer):
+    def __init__(
+        self,
+        sharded_graph: ShardedGraph,
+        image_backend: ImageBackendProtocol | None = None,
+        max_workers: int = 4,
+        extension: str = "png",
+        instrumentation: Instrumentation | None = None
+    ):
+        super().__init__(sharded_graph.graph, instrumentation=instrumentation)
+
+        self.sharded_graph = sharded_graph
+        self.image_backend = image_backend if image_backend is not None else MermaidInkBackend()
+        self.max_workers = max_workers
+        self.extension = extension
+
+    def write(self, directory: str) -> None:
+        self.sharded_graph.write(directory)
+
+    def render(self, directory: str = "diagrams/shards"):
+        os.makedirs(directory, exist_ok=True)
+
+        documents = {INDEX_NAME: self.sharded_graph.index_mermaid_js_code(f".{self.extension}")}
+        for shard in self.sharded_graph.shards:
+            documents[shard.name] = shard.graph.to_mermaid_js_code()
+
+        with self.stage("render") as report:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for name, content in zip(documents.keys(), executor.map(self.image_backend.fetch, documents.values())):
+                    with open(os.path.join(directory, f"{name}.{self.extension}"), "wb") as file:
+                        file.write(content)
+
+                    if report is not None:
+                        report.bytes_received += len(content)
+
+
+class DotRenderer(BaseRenderer):
+    def __init__(
+        self,
+        graph: Graph,
+        engine: str = "dot",
+        output_format: str = "png",
+        filename: str = "diagrams/diagram",
+        instrumentation: Instrumentation | None = None
+    ):
+        super().__init__(graph, instrumentation=instrumentation)
+
+        self.engine = engine
+        self.output_format = output_format
+        self.filename = filename
+
+    @property
+    def graph_code(self) -> str:
+        return "".join(self.iter_graph_code())
+
+    def iter_graph_code(self) -> Iterator[str]:
+        return self.graph.iter_dot_code()
+
+    def write(self, sink: str | TextIO) -> None:
+        if isinstance(sink, str):
+            with open(sink, "w") as file:
+                self.graph.write_dot_code(file)
+        else:
+            self.graph.write_dot_code(sink)
+
+    @property
+    def output_path(self) -> str:
+        return f"{self.filename}.{self.output_format}"
+
+    def render(self):
+        with self.stage("render"):
+            directory = os.path.dirname(self.output_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            process = subprocess.Popen(
+                [self.engine, f"-T{self.output_format}", "-o", self.output_path],
+                stdin=subprocess.PIPE,
+                text=True,
+            )
+            try:
+                self.graph.write_dot_code(process.stdin)
+            finally:
+                process.stdin.close()
+
+            return_code = process.wait()
+            if return_code != 0:
+                raise subprocess.CalledProcessError(return_code, process.args)
+
+
 class DiagramsRenderer(BaseRenderer):
     def render(self):
-        self.graph.to_diagrams()
+        with self.stage("render"):
+            self.graph.to_diagrams()
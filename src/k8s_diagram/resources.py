@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from k8s_diagram.types.base import GraphNode
+from k8s_diagram.types.kubernetes import CronJob, Deployment, Job, Namespace, Pod, ReplicaSet, Service, StatefulSet
+
+
+def name_key(graph_node: GraphNode) -> str:
+    return graph_node.name
+
+
+def namespaced_name_key(graph_node: GraphNode) -> str:
+    return f"{graph_node.namespace}/{graph_node.object_name or graph_node.name}"
+
+
+def uid_key(graph_node: GraphNode) -> str:
+    return graph_node.uid
+
+
+@dataclass(frozen=True)
+class Resource:
+    graph_node_type: type[GraphNode]
+    attribute: str
+    api: str
+    list_function: str
+    namespaced_list_function: str | None = None
+    metadata_path: str | None = None
+    key: Callable[[GraphNode], str] = name_key
+
+    @property
+    def namespaced(self) -> bool:
+        return self.namespaced_list_function is not None
+
+    def namespaced_metadata_path(self, namespace: str) -> str:
+        prefix, _, plural = self.metadata_path.rpartition("/")
+
+        return f"{prefix}/namespaces/{namespace}/{plural}"
+
+
+NAMESPACES = Resource(Namespace, "namespaces", "core_v1_api", "list_namespace")
+SERVICES = Resource(
+    Service, "services", "core_v1_api", "list_service_for_all_namespaces",
+    namespaced_list_function="list_namespaced_service",
+    key=namespaced_name_key,
+)
+PODS = Resource(
+    Pod, "pods", "core_v1_api", "list_pod_for_all_namespaces",
+    namespaced_list_function="list_namespaced_pod",
+    metadata_path="/api/v1/pods",
+    key=uid_key,
+)
+DEPLOYMENTS = Resource(
+    Deployment, "deployments", "apps_v1_api", "list_deployment_for_all_namespaces",
+    namespaced_list_function="list_namespaced_deployment",
+    metadata_path="/apis/apps/v1/deployments",
+    key=namespaced_name_key,
+)
+REPLICA_SETS = Resource(
+    ReplicaSet, "replica_sets", "apps_v1_api", "list_replica_set_for_all_namespaces",
+    namespaced_list_function="list_namespaced_replica_set",
+    metadata_path="/apis/apps/v1/replicasets",
+    key=namespaced_name_key,
+)
+STATEFUL_SETS = Resource(
+    StatefulSet, "stateful_sets", "apps_v1_api", "list_stateful_set_for_all_namespaces",
+    namespaced_list_function="list_namespaced_stateful_set",
+    key=namespaced_name_key,
+)
+JOBS = Resource(
+    Job, "jobs", "batch_v1_api", "list_job_for_all_namespaces",
+    namespaced_list_function="list_namespaced_job",
+    metadata_path="/apis/batch/v1/jobs",
+    key=namespaced_name_key,
+)
+CRON_JOBS = Resource(
+    CronJob, "cron_jobs", "batch_v1_api", "list_cron_job_for_all_namespaces",
+    namespaced_list_function="list_namespaced_cron_job",
+    key=namespaced_name_key,
+)
+
+RESOURCES = [NAMESPACES, SERVICES, PODS, DEPLOYMENTS, REPLICA_SETS, STATEFUL_SETS, JOBS, CRON_JOBS]
+
+OWNERSHIPS: list[tuple[Resource, list[Resource]]] = [
+    (REPLICA_SETS, [DEPLOYMENTS]),
+    (PODS, [REPLICA_SETS, JOBS]),
+    (JOBS, [CRON_JOBS]),
+]
+OWNER_RESOURCES = [DEPLOYMENTS, REPLICA_SETS, JOBS, CRON_JOBS]
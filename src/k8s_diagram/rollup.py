@@ -0,0 +1,146 @@
+import copy
+from dataclasses import dataclass
+from typing import Iterator
+
+from k8s_diagram.types.base import Graph, GraphNode, SubGraph
+from k8s_diagram.types.kubernetes import App, CollapsedGroup, Job, Pod, PodGroup, ReplicaSet, StatefulSet, System
+
+POD_OWNER_TYPES = (ReplicaSet, StatefulSet, Job)
+
+
+@dataclass
+class LevelOfDetail:
+    pod_threshold: int | None = 5
+    app_threshold: int | None = None
+    system_threshold: int | None = None
+
+
+def leaf_nodes(graph_node: GraphNode) -> Iterator[GraphNode]:
+    if isinstance(graph_node, SubGraph):
+        for member in (graph_node.graph_nodes or dict()).values():
+            yield from leaf_nodes(member)
+    else:
+        yield graph_node
+
+
+class Rollup:
+    def __init__(self, level_of_detail: LevelOfDetail):
+        self.level_of_detail = level_of_detail
+        self.replacements: dict[str, GraphNode] = dict()
+        self.groups: list[tuple[GraphNode, list[GraphNode]]] = []
+        self.copies: dict[str, GraphNode] = dict()
+
+    def rollup(self, graph: Graph) -> Graph:
+        graph_nodes = (graph.graph_nodes or dict()).values()
+
+        for graph_node in graph_nodes:
+            self.plan_collapsed_groups(graph_node)
+        for graph_node in graph_nodes:
+            for leaf in leaf_nodes(graph_node):
+                self.plan_pod_group(leaf)
+        for graph_node in graph_nodes:
+            for leaf in leaf_nodes(graph_node):
+                if leaf.id not in self.replacements:
+                    self.copies[leaf.id] = copy.copy(leaf)
+
+        for graph_node in self.copies.values():
+            self.relate(graph_node, [graph_node])
+        for replacement, members in self.groups:
+            self.relate(replacement, members)
+
+        rolled_up = copy.copy(graph)
+        rolled_up.graph_nodes = self.rebuild_members(graph.graph_nodes or dict())
+
+        return rolled_up
+
+    def threshold(self, subgraph: SubGraph) -> int | None:
+        if isinstance(subgraph, App):
+            return self.level_of_detail.app_threshold
+        if isinstance(subgraph, System):
+            return self.level_of_detail.system_threshold
+
+        return None
+
+    def plan_collapsed_groups(self, graph_node: GraphNode) -> None:
+        if not isinstance(graph_node, SubGraph):
+            return
+
+        threshold = self.threshold(graph_node)
+        if threshold is not None:
+            leaves = list(leaf_nodes(graph_node))
+            if len(leaves) > threshold:
+                group = CollapsedGroup(
+                    f"{graph_node.prefix}: {graph_node.name}",
+                    graph_node.id,
+                    namespace=leaves[0].namespace if leaves else None,
+                    count=len(leaves),
+                )
+                self.replace(graph_node, group, leaves)
+                return
+
+        for member in (graph_node.graph_nodes or dict()).values():
+            self.plan_collapsed_groups(member)
+
+    def plan_pod_group(self, graph_node: GraphNode) -> None:
+        threshold = self.level_of_detail.pod_threshold
+        if threshold is None or not isinstance(graph_node, POD_OWNER_TYPES) or graph_node.id in self.replacements:
+            return
+
+        pods = [
+            related_node
+            for related_node in (graph_node.related_nodes or dict()).values()
+            if isinstance(related_node, Pod) and related_node.id not in self.replacements
+        ]
+        if len(pods) <= threshold:
+            return
+
+        group = PodGroup(
+            "pods",
+            graph_node.id,
+            namespace=graph_node.namespace,
+            count=len(pods),
+            app=graph_node.app,
+            system=graph_node.system,
+        )
+        self.replace(None, group, pods)
+
+    def replace(self, subgraph: SubGraph | None, replacement: GraphNode, members: list[GraphNode]) -> None:
+        if subgraph is not None:
+            self.replacements[subgraph.id] = replacement
+
+        for member in members:
+            self.replacements[member.id] = replacement
+
+        self.groups.append((replacement, members))
+
+    def resolve(self, graph_node: GraphNode) -> GraphNode:
+        return self.replacements.get(graph_node.id) or self.copies.get(graph_node.id) or graph_node
+
+    def relate(self, graph_node: GraphNode, members: list[GraphNode]) -> None:
+        related_nodes = dict()
+        for member in members:
+            for related_node in (member.related_nodes or dict()).values():
+                resolved = self.resolve(related_node)
+                if resolved is not graph_node:
+                    related_nodes[resolved.id] = resolved
+
+        graph_node.related_nodes = related_nodes if related_nodes else None
+
+    def rebuild_members(self, graph_nodes: dict[str, GraphNode]) -> dict[str, GraphNode]:
+        rebuilt = dict()
+        for graph_node_id, graph_node in graph_nodes.items():
+            replacement = self.replacements.get(graph_node_id)
+            if replacement is not None:
+                rebuilt[replacement.id] = replacement
+            elif isinstance(graph_node, SubGraph):
+                subgraph = copy.copy(graph_node)
+                subgraph.graph_nodes = self.rebuild_members(graph_node.graph_nodes or dict())
+                rebuilt[subgraph.id] = subgraph
+            else:
+                rebuilt[graph_node_id] = self.copies[graph_node_id]
+
+        return rebuilt
+
+
+def rollup(graph: Graph, level_of_detail: LevelOfDetail) -> Graph:
+    return Rollup(level_of_detail).rollup(graph)
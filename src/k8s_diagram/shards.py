@@ -0,0 +1,136 @@
+import os
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Iterator, TextIO
+
+from k8s_diagram.neighborhood import NeighborhoodIndex
+from k8s_diagram.rollup import leaf_nodes
+from k8s_diagram.types.base import Graph, GraphNode, SubGraph
+
+INDEX_NAME = "index"
+
+
+@dataclass
+class Shard:
+    name: str
+    label: str
+    graph: Graph
+    nodes: int
+    edges: int
+
+    @property
+    def id(self) -> str:
+        return self.name.replace("-", "_")
+
+
+class ShardedGraph:
+    def __init__(self, graph: Graph, max_nodes: int = 300, max_edges: int | None = None):
+        self.graph = graph
+        self.max_nodes = max_nodes
+        self.max_edges = max_edges
+
+        if graph.neighborhood_index is None:
+            graph.neighborhood_index = NeighborhoodIndex(graph)
+        self.index = graph.neighborhood_index
+
+        self.shards: list[Shard] = []
+        self.links: dict[tuple[int, int], int] = dict()
+        self.split()
+
+    @staticmethod
+    def cost(graph_nodes: list[GraphNode]) -> tuple[int, int]:
+        return len(graph_nodes), sum(len(graph_node.related_nodes or ()) for graph_node in graph_nodes)
+
+    def fits(self, nodes: int, edges: int) -> bool:
+        return nodes <= self.max_nodes and (self.max_edges is None or edges <= self.max_edges)
+
+    def units(self, graph_nodes: Iterable[GraphNode]) -> Iterator[list[GraphNode]]:
+        for graph_node in graph_nodes:
+            leaves = list(leaf_nodes(graph_node))
+            if not leaves:
+                continue
+
+            if isinstance(graph_node, SubGraph) and not self.fits(*self.cost(leaves)):
+                yield from self.units((graph_node.graph_nodes or dict()).values())
+            else:
+                yield leaves
+
+    def bins(self) -> Iterator[list[GraphNode]]:
+        current: list[GraphNode] = []
+        nodes = edges = 0
+
+        for unit in self.units((self.graph.graph_nodes or dict()).values()):
+            unit_nodes, unit_edges = self.cost(unit)
+            if current and not self.fits(nodes + unit_nodes, edges + unit_edges):
+                yield current
+                current, nodes, edges = [], 0, 0
+
+            current.extend(unit)
+            nodes += unit_nodes
+            edges += unit_edges
+
+        if current:
+            yield current
+
+    def split(self) -> None:
+        bins = list(self.bins())
+        labels = [self.label(graph_nodes) for graph_nodes in bins]
+        totals = Counter(labels)
+        parts: Counter[str] = Counter()
+
+        shard_of: dict[str, int] = dict()
+        for position, (graph_nodes, label) in enumerate(zip(bins, labels)):
+            for graph_node in graph_nodes:
+                shard_of[graph_node.id] = position
+
+            if totals[label] > 1:
+                parts[label] += 1
+                label = f"{label} ({parts[label]}/{totals[label]})"
+
+            graph = self.index.prune({graph_node.id: graph_node for graph_node in graph_nodes})
+            graph.title = f"{self.graph.title}: {label}"
+
+            self.shards.append(Shard(f"shard-{position + 1:03d}", label, graph, *self.cost(graph_nodes)))
+
+        for graph_node_id, position in shard_of.items():
+            related_nodes = self.index.graph_nodes[graph_node_id].related_nodes or dict()
+            for related_node_id in related_nodes.keys():
+                other = shard_of.get(related_node_id)
+                if other is not None and other != position:
+                    key = (min(position, other), max(position, other))
+                    self.links[key] = self.links.get(key, 0) + 1
+
+    @staticmethod
+    def label(graph_nodes: list[GraphNode]) -> str:
+        namespaces = list(dict.fromkeys(str(graph_node.namespace) for graph_node in graph_nodes))
+        if len(namespaces) > 3:
+            return f"{', '.join(namespaces[:3])} +{len(namespaces) - 3}"
+
+        return ", ".join(namespaces)
+
+    def index_mermaid_js_code(self, extension: str = ".mmd") -> str:
+        return "".join(self.iter_index_mermaid_js_code(extension))
+
+    def iter_index_mermaid_js_code(self, extension: str = ".mmd") -> Iterator[str]:
+        yield "graph LR\n"
+
+        for shard in self.shards:
+            yield f"{shard.id}[\"{shard.label}<br/>{shard.nodes} objects\"]\n"
+            yield f"click {shard.id} \"{shard.name}{extension}\"\n"
+
+        for (source, target), count in self.links.items():
+            yield f"{self.shards[source].id} ---|{count}| {self.shards[target].id}\n"
+
+    def write_index_mermaid_js_code(self, sink: TextIO, extension: str = ".mmd") -> None:
+        for chunk in self.iter_index_mermaid_js_code(extension):
+            sink.write(chunk)
+
+    def write(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, f"{INDEX_NAME}.mmd"), "w") as file:
+            self.write_index_mermaid_js_code(file)
+
+        for shard in self.shards:
+            with open(os.path.join(directory, f"{shard.name}.mmd"), "w") as file:
+                shard.graph.write_mermaid_js_code(file)
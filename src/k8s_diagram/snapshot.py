@@ -0,0 +1,327 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Self
+
+from k8s_diagram.parser import Parser
+from k8s_diagram.resources import NAMESPACES, RESOURCES, Resource
+from k8s_diagram.types.base import GraphNode
+from k8s_diagram.types.kubernetes import CronJob, Deployment, Job, Namespace, Pod, ReplicaSet, Service, StatefulSet
+
+MAGIC = b"K8SDSNAP"
+VERSION = 1
+NONE = 0xFFFFFFFF
+
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<16sQQ")
+COUNTS = struct.Struct("<II")
+
+STRING = 0
+LABELS = 1
+
+COMMON_COLUMNS = [("name", STRING), ("uid", STRING), ("object_uid", STRING), ("object_name", STRING)]
+NAMESPACED_COLUMNS = COMMON_COLUMNS + [
+    ("namespace", STRING), ("app", STRING), ("system", STRING), ("css_class", STRING), ("labels", LABELS),
+    ("annotations", LABELS),
+]
+
+COLUMNS: dict[type[GraphNode], list[tuple[str, int]]] = {
+    Namespace: COMMON_COLUMNS + [("status_phase", STRING)],
+    Service: NAMESPACED_COLUMNS + [("selectors", LABELS)],
+    Pod: NAMESPACED_COLUMNS + [("owner_uid", STRING)],
+    Deployment: NAMESPACED_COLUMNS,
+    ReplicaSet: NAMESPACED_COLUMNS + [("owner_uid", STRING)],
+    StatefulSet: NAMESPACED_COLUMNS + [("selectors", LABELS)],
+    Job: NAMESPACED_COLUMNS + [("owner_uid", STRING)],
+    CronJob: NAMESPACED_COLUMNS,
+}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _u32(values: list[int]) -> bytes:
+    column = array("I", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+
+    return column.tobytes()
+
+
+def _read_u32(buffer: memoryview, offset: int, count: int) -> array:
+    column = array("I")
+    column.frombytes(buffer[offset:offset + 4 * count])
+    if sys.byteorder == "big":
+        column.byteswap()
+
+    return column
+
+
+class SnapshotWriter:
+    def __init__(self):
+        self.strings: dict[str, int] = dict()
+        self.label_sets: dict[tuple[tuple[str, str], ...], int] = dict()
+
+    def string(self, value: str | None) -> int:
+        if value is None:
+            return NONE
+
+        index = self.strings.get(value)
+        if index is None:
+            index = len(self.strings)
+            self.strings[value] = index
+
+        return index
+
+    def labels(self, labels: dict[str, str] | None) -> int:
+        if labels is None:
+            return NONE
+
+        key = tuple(labels.items())
+        index = self.label_sets.get(key)
+        if index is None:
+            index = len(self.label_sets)
+            self.label_sets[key] = index
+
+        return index
+
+    def kind_section(self, resource: Resource, graph_nodes: dict[str, GraphNode]) -> bytes:
+        columns = COLUMNS[resource.graph_node_type]
+
+        encoded = []
+        for attribute, column_type in columns:
+            encode = self.string if column_type == STRING else self.labels
+            encoded.append(_u32([encode(getattr(graph_node, attribute)) for graph_node in graph_nodes.values()]))
+
+        header = COUNTS.pack(len(graph_nodes), len(columns))
+        header += b"".join(struct.pack("<IB", self.string(attribute), column_type) for attribute, column_type in columns)
+
+        return header + b"".join(encoded)
+
+    @staticmethod
+    def kinds(parser: Parser) -> list[dict[str, GraphNode]]:
+        shown = {NAMESPACES, *parser.plan.shown}
+
+        return [
+            (getattr(parser, resource.attribute) or dict()) if resource in shown else dict()
+            for resource in RESOURCES
+        ]
+
+    def edges_section(self, kinds: list[dict[str, GraphNode]]) -> bytes:
+        rows: dict[str, tuple[int, int]] = dict()
+        for kind, graph_nodes in enumerate(kinds):
+            for row, graph_node in enumerate(graph_nodes.values()):
+                rows[graph_node.id] = (kind, row)
+
+        columns = ([], [], [], [])
+        for graph_nodes in kinds:
+            for graph_node in graph_nodes.values():
+                if graph_node.related_nodes is None:
+                    continue
+
+                source_kind, source_row = rows[graph_node.id]
+                for related_id in graph_node.related_nodes.keys():
+                    if related_id not in rows:
+                        continue
+
+                    target_kind, target_row = rows[related_id]
+                    for column, value in zip(columns, (source_kind, source_row, target_kind, target_row)):
+                        column.append(value)
+
+        return struct.pack("<I", len(columns[0])) + b"".join(_u32(column) for column in columns)
+
+    def labels_section(self) -> bytes:
+        offsets = [0]
+        pairs = []
+        for label_set in self.label_sets.keys():
+            for key, value in label_set:
+                pairs.append(self.string(key))
+                pairs.append(self.string(value))
+            offsets.append(len(pairs) // 2)
+
+        return struct.pack("<I", len(self.label_sets)) + _u32(offsets) + _u32(pairs)
+
+    def strings_section(self) -> bytes:
+        encoded = [value.encode("utf-8") for value in self.strings.keys()]
+
+        offsets = [0]
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+
+        return struct.pack("<I", len(encoded)) + _u32(offsets) + b"".join(encoded)
+
+    def write(self, parser: Parser, path: str) -> None:
+        kinds = self.kinds(parser)
+
+        sections = []
+        for resource, graph_nodes in zip(RESOURCES, kinds):
+            sections.append((resource.attribute, self.kind_section(resource, graph_nodes)))
+
+        sections.append(("edges", self.edges_section(kinds)))
+        sections.append(("labels", self.labels_section()))
+        sections.append(("strings", self.strings_section()))
+
+        offset = HEADER.size + SECTION.size * len(sections)
+        table = []
+        for name, content in sections:
+            table.append(SECTION.pack(name.encode("ascii"), offset, len(content)))
+            offset += len(content)
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(sections)))
+            file.write(b"".join(table))
+            for _, content in sections:
+                file.write(content)
+
+
+class Snapshot:
+    def __init__(self, buffer: memoryview, closer=None):
+        self.buffer = buffer
+        self._closer = closer
+
+        magic, version, section_count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise SnapshotError("not a k8s_diagram snapshot")
+        if version > VERSION:
+            raise SnapshotError(f"snapshot version {version} is newer than the supported version {VERSION}")
+
+        self.version = version
+        self.sections: dict[str, tuple[int, int]] = dict()
+        for index in range(section_count):
+            name, offset, length = SECTION.unpack_from(buffer, HEADER.size + index * SECTION.size)
+            self.sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+        self._string_offsets: array | None = None
+        self._string_base = 0
+        self._strings: dict[int, str] = dict()
+        self._label_sets: dict[int, dict[str, str]] = dict()
+        self._label_offsets: array | None = None
+        self._label_pairs: array | None = None
+
+    @classmethod
+    def open(cls, path: str) -> Self:
+        file = open(path, "rb")
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        def close():
+            mapped.close()
+            file.close()
+
+        return cls(memoryview(mapped), closer=close)
+
+    def close(self) -> None:
+        self.buffer.release()
+        if self._closer is not None:
+            self._closer()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def string(self, index: int) -> str | None:
+        if index == NONE:
+            return None
+
+        value = self._strings.get(index)
+        if value is None:
+            if self._string_offsets is None:
+                offset, _ = self.sections["strings"]
+                (count,) = struct.unpack_from("<I", self.buffer, offset)
+                self._string_offsets = _read_u32(self.buffer, offset + 4, count + 1)
+                self._string_base = offset + 4 + 4 * (count + 1)
+
+            start = self._string_base + self._string_offsets[index]
+            end = self._string_base + self._string_offsets[index + 1]
+            value = str(self.buffer[start:end], "utf-8")
+            self._strings[index] = value
+
+        return value
+
+    def labels(self, index: int) -> dict[str, str] | None:
+        if index == NONE:
+            return None
+
+        labels = self._label_sets.get(index)
+        if labels is None:
+            if self._label_offsets is None:
+                offset, _ = self.sections["labels"]
+                (count,) = struct.unpack_from("<I", self.buffer, offset)
+                self._label_offsets = _read_u32(self.buffer, offset + 4, count + 1)
+                self._label_pairs = _read_u32(self.buffer, offset + 4 + 4 * (count + 1), 2 * self._label_offsets[count])
+
+            pairs = self._label_pairs
+            labels = {
+                self.string(pairs[2 * pair]): self.string(pairs[2 * pair + 1])
+                for pair in range(self._label_offsets[index], self._label_offsets[index + 1])
+            }
+            self._label_sets[index] = labels
+
+        return labels
+
+    def graph_nodes(self, resource: Resource) -> dict[str, GraphNode]:
+        offset, _ = self.sections[resource.attribute]
+        rows, column_count = COUNTS.unpack_from(self.buffer, offset)
+        offset += COUNTS.size
+
+        columns = []
+        for _ in range(column_count):
+            name_index, column_type = struct.unpack_from("<IB", self.buffer, offset)
+            columns.append((self.string(name_index), column_type))
+            offset += 5
+
+        known = {attribute for attribute, _ in COLUMNS[resource.graph_node_type]}
+        decoded = []
+        for attribute, column_type in columns:
+            values = _read_u32(self.buffer, offset, rows)
+            offset += 4 * rows
+
+            if attribute in known:
+                decode = self.string if column_type == STRING else self.labels
+                decoded.append((attribute, [decode(value) for value in values]))
+
+        graph_nodes = dict()
+        for row in range(rows):
+            graph_node = resource.graph_node_type(**{attribute: values[row] for attribute, values in decoded})
+            graph_nodes[resource.key(graph_node)] = graph_node
+
+        return graph_nodes
+
+    def edges(self) -> tuple[array, array, array, array]:
+        offset, _ = self.sections["edges"]
+        (count,) = struct.unpack_from("<I", self.buffer, offset)
+        offset += 4
+
+        return tuple(_read_u32(self.buffer, offset + 4 * count * column, count) for column in range(4))
+
+    def parser(self, **kwargs) -> Parser:
+        parser = Parser(api_client=None, **kwargs)
+
+        rows: list[list[GraphNode]] = []
+        for resource in RESOURCES:
+            graph_nodes = self.graph_nodes(resource)
+            setattr(parser, resource.attribute, graph_nodes)
+            rows.append(list(graph_nodes.values()))
+
+        for source_kind, source_row, target_kind, target_row in zip(*self.edges()):
+            rows[source_kind][source_row].add_related_node(rows[target_kind][target_row])
+
+        for resource in RESOURCES[1:]:
+            for graph_node in getattr(parser, resource.attribute).values():
+                namespace = parser.namespaces.get(graph_node.namespace)
+                if namespace is not None:
+                    namespace.add_graph_node(graph_node)
+
+        return parser.organize()
+
+
+def write_snapshot(parser: Parser, path: str) -> None:
+    SnapshotWriter().write(parser, path)
+
+
+def load_snapshot(path: str, **kwargs) -> Parser:
+    with Snapshot.open(path) as snapshot:
+        return snapshot.parser(**kwargs)
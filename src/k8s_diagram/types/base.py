@@ -1,12 +1,65 @@
+import sys
 import uuid
 from abc import abstractmethod
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping, TextIO
 
-from diagrams import Cluster, Diagram
-from kubernetes.client import V1ObjectMeta
+from k8s_diagram.instrumentation import StageReport
 
+if TYPE_CHECKING:
+    from k8s_diagram.fragments import FragmentCache
+    from k8s_diagram.neighborhood import NeighborhoodIndex, Seed
 
-@dataclass
+DOT_STYLES = {
+    "svc": ', shape=ellipse, fillcolor="red"',
+    "pod": ', shape=box, fillcolor="blue", fontcolor="white"',
+    "dep": ', shape=box3d, fillcolor="green"',
+    "rset": ', shape=component, fillcolor="yellow"',
+    "sset": ', shape=cylinder, fillcolor="magenta"',
+    "job": ', shape=cds, fillcolor="purple", fontcolor="white"',
+    "cjob": ', shape=cds',
+}
+
+LABEL_POOL_SIZE = 65536
+POD_UNIQUE_LABEL_KEYS = frozenset(
+    {
+        "statefulset.kubernetes.io/pod-name",
+        "apps.kubernetes.io/pod-index",
+        "batch.kubernetes.io/job-completion-index",
+    }
+)
+
+
+def dot_quote(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def intern_string(value: str | None) -> str | None:
+    return None if value is None else sys.intern(value)
+
+
+def intern_labels(labels: Mapping[str, str] | None) -> Mapping[str, str] | None:
+    if labels is None:
+        return None
+
+    if POD_UNIQUE_LABEL_KEYS.isdisjoint(labels.keys()):
+        return _shared_labels(tuple(labels.items()))
+
+    return _interned_labels(labels.items())
+
+
+@lru_cache(maxsize=LABEL_POOL_SIZE)
+def _shared_labels(items: tuple[tuple[str, str], ...]) -> Mapping[str, str]:
+    return _interned_labels(items)
+
+
+def _interned_labels(items: Iterable[tuple[str, str]]) -> Mapping[str, str]:
+    return MappingProxyType({sys.intern(key): sys.intern(value) for key, value in items})
+
+
+@dataclass(slots=True)
 class GraphNode:
     prefix: str
     name: str
@@ -17,6 +70,21 @@ class GraphNode:
     css_class: str | None = None
     related_nodes: dict[str, "GraphNode"] | None = None
     __id: str | None = None
+    object_uid: str | None = None
+    object_name: str | None = None
+    owner_uid: str | None = None
+    labels: Mapping[str, str] | None = None
+    annotations: Mapping[str, str] | None = None
+
+    def __post_init__(self):
+        self.prefix = intern_string(self.prefix)
+        self.namespace = intern_string(self.namespace)
+        self.app = intern_string(self.app)
+        self.system = intern_string(self.system)
+        self.css_class = intern_string(self.css_class)
+        self.owner_uid = intern_string(self.owner_uid)
+        self.labels = intern_labels(self.labels)
+        self.annotations = intern_labels(self.annotations)
 
     @property
     def id(self) -> str:
@@ -25,6 +93,10 @@ class GraphNode:
 
         return self.__id
 
+    @property
+    def label(self) -> str:
+        return self.name
+
     def add_related_node(self, graph_node: "GraphNode") -> None:
         if self.related_nodes is None:
             self.related_nodes = dict()
@@ -32,11 +104,14 @@ class GraphNode:
         self.related_nodes[graph_node.id] = graph_node
 
     def to_mermaid_js_code(self) -> str:
+        return "".join(self.iter_mermaid_js_code())
+
+    def iter_mermaid_js_code(self, fragment_cache: "FragmentCache | None" = None) -> Iterator[str]:
         style = ""
         if self.css_class is not None:
             style += f":::{self.css_class}"
 
-        return f"{self.id}(\"{self.name}\"){style}\n"
+        yield f"{self.id}(\"{self.name}\"){style}\n"
 
     def relations_to_mermaid_js_code(self) -> str:
         if self.related_nodes is None or len(self.related_nodes) == 0:
@@ -46,6 +121,14 @@ class GraphNode:
 
         return f"{self.id} --> {related_node_ids}\n"
 
+    def iter_dot_code(self) -> Iterator[str]:
+        yield f"{self.id} [label=\"{dot_quote(self.label)}\"{DOT_STYLES.get(self.css_class, '')}];\n"
+
+    def iter_dot_edges(self) -> Iterator[str]:
+        if self.related_nodes is not None:
+            for related_node_id in self.related_nodes.keys():
+                yield f"{self.id} -> {related_node_id};\n"
+
     def to_diagrams(self) -> None:
         diagrams_node = self.diagrams_node
 
@@ -54,30 +137,55 @@ class GraphNode:
                 diagrams_node >> node.diagrams_node
 
     @staticmethod
-    def resolve_app_name(metadata: V1ObjectMeta) -> str | None:
+    def resolve_app_name(labels: dict[str, str] | None) -> str | None:
         app = None
-        if metadata.labels is not None:
-            if "app.kubernetes.io/name" in metadata.labels:
-                app = metadata.labels["app.kubernetes.io/name"]
-            elif "app" in metadata.labels:
-                app = metadata.labels["app"]
+        if labels is not None:
+            if "app.kubernetes.io/name" in labels:
+                app = labels["app.kubernetes.io/name"]
+            elif "app" in labels:
+                app = labels["app"]
 
         return app
 
     @staticmethod
-    def resolve_system_name(metadata: V1ObjectMeta) -> str | None:
+    def resolve_system_name(labels: dict[str, str] | None) -> str | None:
         system = None
-        if metadata.labels is not None and "app.kubernetes.io/part-of" in metadata.labels:
-            system = metadata.labels["app.kubernetes.io/part-of"]
+        if labels is not None and "app.kubernetes.io/part-of" in labels:
+            system = labels["app.kubernetes.io/part-of"]
 
         return system
 
+    @staticmethod
+    def resolve_owner_uid(owner_references: list | None) -> str | None:
+        if not owner_references:
+            return None
+
+        for reference in owner_references:
+            if reference.controller:
+                return reference.uid
+
+        return owner_references[0].uid
+
+    @staticmethod
+    def resolve_owner_uid_from_dict(owner_references: list[dict] | None) -> str | None:
+        if not owner_references:
+            return None
+
+        for reference in owner_references:
+            if reference.get("controller"):
+                return reference["uid"]
+
+        return owner_references[0]["uid"]
+
 
 @dataclass
 class Graph:
     title: str
     graph_nodes: dict[str, GraphNode] | None = None
     color: str | None = None
+    report: list[StageReport] | None = None
+    fragment_cache: "FragmentCache | None" = None
+    neighborhood_index: "NeighborhoodIndex | None" = None
 
     @property
     def styles(self) -> str:
@@ -95,6 +203,7 @@ class Graph:
             self.graph_nodes = dict()
 
         self.graph_nodes[graph_node.id] = graph_node
+        self.neighborhood_index = None
 
     def add_graph_nodes(self, graph_nodes: dict[str, GraphNode]) -> None:
         for gn in graph_nodes.values():
@@ -104,17 +213,54 @@ class Graph:
         for gn in graph_nodes.keys():
             self.graph_nodes.pop(gn, None)
 
+        self.neighborhood_index = None
+
+    def neighborhood(self, seeds: "Iterable[Seed]", hops: int = 1) -> "Graph":
+        if self.neighborhood_index is None:
+            from k8s_diagram.neighborhood import NeighborhoodIndex
+
+            self.neighborhood_index = NeighborhoodIndex(self)
+
+        return self.neighborhood_index.neighborhood(seeds, hops=hops)
+
     def to_mermaid_js_code(self) -> str:
-        code = f"graph TB\n"
+        return "".join(self.iter_mermaid_js_code())
+
+    def iter_mermaid_js_code(self) -> Iterator[str]:
+        yield f"graph TB\n"
 
         for graph_node in self.graph_nodes.values():
-            code += graph_node.to_mermaid_js_code()
+            yield from graph_node.iter_mermaid_js_code(self.fragment_cache)
+
+        yield self.styles
+
+    def write_mermaid_js_code(self, sink: TextIO) -> None:
+        for chunk in self.iter_mermaid_js_code():
+            sink.write(chunk)
+
+    def to_dot_code(self) -> str:
+        return "".join(self.iter_dot_code())
+
+    def iter_dot_code(self) -> Iterator[str]:
+        yield "digraph k8s {\n"
+        yield f"label=\"{dot_quote(self.title)}\";\nrankdir=TB;\n"
+        yield "node [style=filled, fontname=\"Helvetica\"];\n"
+
+        graph_nodes = (self.graph_nodes or dict()).values()
+        for graph_node in graph_nodes:
+            yield from graph_node.iter_dot_code()
+        for graph_node in graph_nodes:
+            yield from graph_node.iter_dot_edges()
 
-        code += self.styles
+        yield "}\n"
 
-        return code
+    def write_dot_code(self, sink: TextIO) -> None:
+        for chunk in self.iter_dot_code():
+            sink.write(chunk)
 
     def to_diagrams(self) -> None:
+        from diagrams import Diagram
+
         with Diagram(self.title, show=False, filename="diagrams/diagram", direction="TB"):
             if self.graph_nodes is not None:
                 for graph_node in self.graph_nodes.values():
@@ -122,20 +268,82 @@ class Graph:
 
 
 class SubGraph(GraphNode, Graph):
+    _graph_nodes: dict[str, GraphNode] | None = None
+    revision: int = 0
+
+    @property
+    def graph_nodes(self) -> dict[str, GraphNode] | None:
+        return self._graph_nodes
+
+    @graph_nodes.setter
+    def graph_nodes(self, graph_nodes: dict[str, GraphNode] | None) -> None:
+        self._graph_nodes = graph_nodes
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        self.revision += 1
+
+    def relations_key(self) -> int:
+        return hash(tuple(tuple(gn.related_nodes) if gn.related_nodes else None for gn in self.graph_nodes.values()))
+
+    def add_graph_node(self, graph_node: GraphNode) -> None:
+        super().add_graph_node(graph_node)
+        self.mark_dirty()
+
+    def remove_graph_nodes(self, graph_nodes: dict[str, GraphNode]) -> None:
+        super().remove_graph_nodes(graph_nodes)
+        self.mark_dirty()
+
     def to_mermaid_js_code(self) -> str:
+        return "".join(self.iter_mermaid_js_code())
+
+    def iter_mermaid_js_code(self, fragment_cache: "FragmentCache | None" = None) -> Iterator[str]:
         if self.graph_nodes is None:
-            return ""
+            return
+
+        if fragment_cache is not None:
+            yield from fragment_cache.iter_fragment(self)
+            return
+
+        for part in self.iter_fragment():
+            if isinstance(part, str):
+                yield part
+            else:
+                yield from part.iter_mermaid_js_code()
+
+    def iter_fragment(self) -> Iterator["str | SubGraph"]:
+        yield f"subgraph {self.id}[\"{self.prefix}: {self.name}\"]\n"
 
-        code = f"subgraph \"{self.prefix}: {self.name}\"\n"
+        for graph_node in self.graph_nodes.values():
+            if isinstance(graph_node, SubGraph):
+                yield graph_node
+            else:
+                yield from graph_node.iter_mermaid_js_code()
+
+        yield f"end\n"
+
+    def iter_dot_code(self) -> Iterator[str]:
+        if self.graph_nodes is None:
+            return
+
+        yield f"subgraph cluster_{self.id} {{\nlabel=\"{dot_quote(self.prefix)}: {dot_quote(self.name)}\";\n"
+        if self.color is not None:
+            yield f"style=filled;\nfillcolor=\"{self.color}\";\n"
 
         for graph_node in self.graph_nodes.values():
-            code += graph_node.to_mermaid_js_code()
+            yield from graph_node.iter_dot_code()
 
-        code += f"end\n"
+        yield "}\n"
 
-        return code
+    def iter_dot_edges(self) -> Iterator[str]:
+        yield from super().iter_dot_edges()
+
+        for graph_node in (self.graph_nodes or dict()).values():
+            yield from graph_node.iter_dot_edges()
 
     def to_diagrams(self) -> None:
+        from diagrams import Cluster
+
         graph_attr = {}
         if self.color is not None:
             graph_attr["bgcolor"] = self.color
@@ -1,131 +1,179 @@
-from typing import Self
-
-from diagrams import Cluster
-from diagrams.k8s.network import SVC
-from diagrams.k8s.compute import Deploy, Pod as P, RS, Job as J, Cronjob as CJ, STS
-from kubernetes.client import (
-    V1CronJob, V1Job, V1JobSpec, V1LabelSelector,
-    V1ObjectMeta,
-    V1Namespace,
-    V1Service,
-    V1Pod,
-    V1Deployment,
-    V1ServiceSpec,
-    V1StatefulSet,
-    V1ReplicaSet,
-    V1StatefulSetSpec,
-)
-
-from k8s_diagram.types.base import SubGraph, GraphNode
+from typing import TYPE_CHECKING, Iterator, Mapping, Self
+
+if TYPE_CHECKING:
+    from diagrams.k8s.network import SVC
+    from diagrams.k8s.compute import Deploy, Pod as P, RS, Job as J, Cronjob as CJ, STS
+    from diagrams.k8s.group import NS
+    from kubernetes.client import (
+        V1CronJob, V1Job, V1JobSpec, V1LabelSelector,
+        V1ObjectMeta,
+        V1Namespace,
+        V1Service,
+        V1Pod,
+        V1Deployment,
+        V1ServiceSpec,
+        V1StatefulSet,
+        V1ReplicaSet,
+        V1StatefulSetSpec,
+    )
+
+from k8s_diagram.fragments import FragmentCache
+from k8s_diagram.types.base import SubGraph, GraphNode, intern_labels
 
 
 class Pod(GraphNode):
+    __slots__ = ("_diagrams_node",)
+
     def __init__(
         self,
         name: str,
         uid: str,
         namespace: str,
         labels: dict[str, str],
-        replica_set_name: str | None = None,
-        job_name: str | None = None,
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        owner_uid: str | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('pod_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('pod_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, owner_uid=owner_uid, labels=labels, annotations=annotations)
 
-        self.replica_set_name = replica_set_name
-        self.job_name = job_name
-        self.labels = labels
         self._diagrams_node: P | None = None
 
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.compute import Pod as P
+
             self._diagrams_node = P(self.name)
 
         return self._diagrams_node
 
     @classmethod
-    def from_object(cls, pod: V1Pod, uid: str) -> Self:
+    def from_object(cls, pod: "V1Pod", uid: str) -> Self:
         metadata: V1ObjectMeta = pod.metadata
         owner_references = metadata.owner_references
 
         name = metadata.name
 
-        replica_set_name = None
-        job_name = None
         if owner_references is not None and len(owner_references) > 0:
             name = metadata.name.split("-")[-1]
-            replica_set_reference = list(filter(lambda ref: ref.kind == 'ReplicaSet', owner_references))
-            if len(replica_set_reference) == 1:
-                replica_set_name = replica_set_reference[0].name.split("-")[-1]
-
-            job_reference = list(filter(lambda ref: ref.kind == 'Job', owner_references))
-            if len(job_reference) == 1:
-                job_name = job_reference[0].name.split("-")[-1]
 
         return cls(
             name=name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
+            owner_uid=cls.resolve_owner_uid(owner_references),
             namespace=metadata.namespace,
             labels=metadata.labels,
-            replica_set_name=replica_set_name,
-            job_name=job_name,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
+            css_class="pod"
+        )
+
+    @classmethod
+    def from_dict(cls, pod: dict, uid: str) -> Self:
+        metadata = pod["metadata"]
+        owner_references = metadata.get("ownerReferences")
+        labels = metadata.get("labels")
+
+        name = metadata["name"]
+
+        if owner_references:
+            name = metadata["name"].split("-")[-1]
+
+        return cls(
+            name=name,
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            owner_uid=cls.resolve_owner_uid_from_dict(owner_references),
+            namespace=metadata["namespace"],
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
             css_class="pod"
         )
 
 
 class Job(GraphNode):
+    __slots__ = ("_diagrams_node",)
+
     def __init__(
         self,
         name: str,
         uid: str,
         namespace: str,
-        cron_job_name: str | None = None,
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        owner_uid: str | None = None,
+        labels: Mapping[str, str] | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('job_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('job_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, owner_uid=owner_uid, labels=labels, annotations=annotations)
 
-        self.cron_job_name = cron_job_name
         self._diagrams_node: J | None = None
 
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.compute import Job as J
+
             self._diagrams_node = J(self.name)
 
         return self._diagrams_node
 
     @classmethod
-    def from_object(cls, job: V1Job, uid: str) -> Self:
+    def from_object(cls, job: "V1Job", uid: str) -> Self:
         metadata: V1ObjectMeta = job.metadata
         owner_references = metadata.owner_references
 
         name = metadata.name.split("-")[-1]
 
-        cron_job_name = None
-        if owner_references is not None:
-            cron_job_references = list(filter(lambda ref: ref.kind == 'CronJob', owner_references))
-            if len(cron_job_references) == 1:
-                cron_job_name = cron_job_references[0].name
-
         return cls(
             name=name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
+            owner_uid=cls.resolve_owner_uid(owner_references),
             namespace=metadata.namespace,
-            cron_job_name=cron_job_name,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            labels=metadata.labels,
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
+            css_class="job",
+        )
+
+    @classmethod
+    def from_dict(cls, job: dict, uid: str) -> Self:
+        metadata = job["metadata"]
+        owner_references = metadata.get("ownerReferences")
+        labels = metadata.get("labels")
+
+        name = metadata["name"].split("-")[-1]
+
+        return cls(
+            name=name,
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            owner_uid=cls.resolve_owner_uid_from_dict(owner_references),
+            namespace=metadata["namespace"],
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
             css_class="job",
         )
 
 
 class CronJob(GraphNode):
+    __slots__ = ("_diagrams_node",)
+
     def __init__(
         self,
         name: str,
@@ -133,34 +181,62 @@ class CronJob(GraphNode):
         namespace: str,
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        labels: Mapping[str, str] | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('cjob_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('cjob_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, labels=labels, annotations=annotations)
 
         self._diagrams_node: CJ | None = None
 
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.compute import Cronjob as CJ
+
             self._diagrams_node = CJ(self.name)
 
         return self._diagrams_node
 
     @classmethod
-    def from_object(cls, job: V1CronJob, uid: str) -> Self:
+    def from_object(cls, job: "V1CronJob", uid: str) -> Self:
         metadata: V1ObjectMeta = job.metadata
 
         return cls(
             name=metadata.name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
             namespace=metadata.namespace,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            labels=metadata.labels,
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
+            css_class="cjob",
+        )
+
+    @classmethod
+    def from_dict(cls, cron_job: dict, uid: str) -> Self:
+        metadata = cron_job["metadata"]
+        labels = metadata.get("labels")
+
+        return cls(
+            name=metadata["name"],
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            namespace=metadata["namespace"],
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
             css_class="cjob",
         )
 
 
 class StatefulSet(GraphNode):
+    __slots__ = ("selectors", "_diagrams_node")
+
     def __init__(
         self,
         name: str,
@@ -169,22 +245,28 @@ class StatefulSet(GraphNode):
         selectors: dict[str, str],
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        labels: Mapping[str, str] | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('sset_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('sset_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, labels=labels, annotations=annotations)
 
-        self.selectors: dict[str, str] = selectors
+        self.selectors: Mapping[str, str] = intern_labels(selectors)
 
         self._diagrams_node: STS | None = None
 
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.compute import STS
+
             self._diagrams_node = STS(self.name)
 
         return self._diagrams_node
     @classmethod
-    def from_object(cls, stateful_set: V1StatefulSet, uid: str) -> Self:
+    def from_object(cls, stateful_set: "V1StatefulSet", uid: str) -> Self:
         metadata: V1ObjectMeta = stateful_set.metadata
         spec: V1StatefulSetSpec = stateful_set.spec
         selector: V1LabelSelector = spec.selector
@@ -192,58 +274,111 @@ class StatefulSet(GraphNode):
         return cls(
             name=metadata.name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
             namespace=metadata.namespace,
             selectors=selector.match_labels,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            labels=metadata.labels,
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
+            css_class="sset",
+        )
+
+    @classmethod
+    def from_dict(cls, stateful_set: dict, uid: str) -> Self:
+        metadata = stateful_set["metadata"]
+        labels = metadata.get("labels")
+
+        return cls(
+            name=metadata["name"],
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            namespace=metadata["namespace"],
+            selectors=stateful_set["spec"]["selector"].get("matchLabels"),
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
             css_class="sset",
         )
 
 
 class ReplicaSet(GraphNode):
+    __slots__ = ("_diagrams_node",)
+
     def __init__(
         self,
         name: str,
         uid: str,
         namespace: str,
-        deployment_name: str,
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        owner_uid: str | None = None,
+        labels: Mapping[str, str] | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('rset_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('rset_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, owner_uid=owner_uid, labels=labels, annotations=annotations)
 
-        self.deployment_name: str = deployment_name
         self._diagrams_node: RS | None = None
 
     @classmethod
-    def from_object(cls, replica_set: V1ReplicaSet, uid: str) -> Self:
+    def from_object(cls, replica_set: "V1ReplicaSet", uid: str) -> Self:
         metadata: V1ObjectMeta = replica_set.metadata
         owner_references = metadata.owner_references
 
         name = metadata.name.split("-")[-1]
 
-        deployment_reference = list(filter(lambda ref: ref.kind == 'Deployment', owner_references))[0]
-
         return cls(
             name=name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
+            owner_uid=cls.resolve_owner_uid(owner_references),
             namespace=metadata.namespace,
-            deployment_name=deployment_reference.name,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            labels=metadata.labels,
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
+            css_class="rset"
+        )
+
+    @classmethod
+    def from_dict(cls, replica_set: dict, uid: str) -> Self:
+        metadata = replica_set["metadata"]
+        labels = metadata.get("labels")
+
+        name = metadata["name"].split("-")[-1]
+
+        owner_references = metadata.get("ownerReferences")
+
+        return cls(
+            name=name,
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            owner_uid=cls.resolve_owner_uid_from_dict(owner_references),
+            namespace=metadata["namespace"],
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
             css_class="rset"
         )
 
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.compute import RS
+
             self._diagrams_node = RS(self.name)
 
         return self._diagrams_node
 
 
 class Deployment(GraphNode):
+    __slots__ = ("_diagrams_node",)
+
     def __init__(
         self,
         name: str,
@@ -251,34 +386,62 @@ class Deployment(GraphNode):
         namespace: str,
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        labels: Mapping[str, str] | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('dep_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('dep_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, labels=labels, annotations=annotations)
 
         self._diagrams_node: Deploy | None = None
 
     @classmethod
-    def from_object(cls, deployment: V1Deployment, uid: str) -> Self:
+    def from_object(cls, deployment: "V1Deployment", uid: str) -> Self:
         metadata: V1ObjectMeta = deployment.metadata
 
         return cls(
             name=metadata.name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
             namespace=metadata.namespace,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            labels=metadata.labels,
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
+            css_class="dep"
+        )
+
+    @classmethod
+    def from_dict(cls, deployment: dict, uid: str) -> Self:
+        metadata = deployment["metadata"]
+        labels = metadata.get("labels")
+
+        return cls(
+            name=metadata["name"],
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            namespace=metadata["namespace"],
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
             css_class="dep"
         )
 
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.compute import Deploy
+
             self._diagrams_node = Deploy(self.name)
 
         return self._diagrams_node
 
 
 class Service(GraphNode):
+    __slots__ = ("selectors", "_diagrams_node")
+
     def __init__(
         self,
         name: str,
@@ -287,15 +450,19 @@ class Service(GraphNode):
         selectors: dict[str, str],
         app: str | None = None,
         system: str | None = None,
-        css_class: str | None = None
+        css_class: str | None = None,
+        object_uid: str | None = None,
+        object_name: str | None = None,
+        labels: Mapping[str, str] | None = None,
+        annotations: Mapping[str, str] | None = None
     ):
-        super().__init__('svc_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class)
+        super().__init__('svc_', name, uid, namespace=namespace, app=app, system=system, css_class=css_class, object_uid=object_uid, object_name=object_name, labels=labels, annotations=annotations)
 
-        self.selectors: dict[str, str] = selectors
+        self.selectors: Mapping[str, str] = intern_labels(selectors)
         self._diagrams_node: SVC | None = None
 
     @classmethod
-    def from_object(cls, service: V1Service, uid: str) -> Self:
+    def from_object(cls, service: "V1Service", uid: str) -> Self:
         metadata: V1ObjectMeta = service.metadata
 
         spec: V1ServiceSpec = service.spec
@@ -303,13 +470,34 @@ class Service(GraphNode):
         return cls(
             name=metadata.name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
             namespace=metadata.namespace,
-            app=cls.resolve_app_name(metadata),
-            system=cls.resolve_system_name(metadata),
+            labels=metadata.labels,
+            app=cls.resolve_app_name(metadata.labels),
+            system=cls.resolve_system_name(metadata.labels),
             selectors=spec.selector,
             css_class="svc"
         )
 
+    @classmethod
+    def from_dict(cls, service: dict, uid: str) -> Self:
+        metadata = service["metadata"]
+        labels = metadata.get("labels")
+
+        return cls(
+            name=metadata["name"],
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            namespace=metadata["namespace"],
+            labels=labels,
+            app=cls.resolve_app_name(labels),
+            system=cls.resolve_system_name(labels),
+            selectors=service["spec"].get("selector"),
+            css_class="svc"
+        )
+
     def relations_to_mermaid_js_code(self) -> str:
         if self.related_nodes is None or len(self.related_nodes) == 0:
             return ""
@@ -318,9 +506,16 @@ class Service(GraphNode):
 
         return f"{related_node_ids} --> {self.id}\n"
 
+    def iter_dot_edges(self) -> Iterator[str]:
+        if self.related_nodes is not None:
+            for related_node_id in self.related_nodes.keys():
+                yield f"{related_node_id} -> {self.id};\n"
+
     @property
     def diagrams_node(self):
         if self._diagrams_node is None:
+            from diagrams.k8s.network import SVC
+
             self._diagrams_node = SVC(self.name)
 
         return self._diagrams_node
@@ -331,19 +526,94 @@ class Service(GraphNode):
                 node.diagrams_node >> self.diagrams_node
 
 
+class PodGroup(GraphNode):
+    __slots__ = ("count", "_diagrams_node")
+
+    def __init__(
+        self,
+        name: str,
+        uid: str,
+        namespace: str,
+        count: int,
+        app: str | None = None,
+        system: str | None = None
+    ):
+        super().__init__('pods_', name, uid, namespace=namespace, app=app, system=system, css_class="pod")
+
+        self.count = count
+        self._diagrams_node: P | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} x{self.count}"
+
+    def iter_mermaid_js_code(self, fragment_cache: FragmentCache | None = None) -> Iterator[str]:
+        yield f"{self.id}[[\"{self.label}\"]]:::{self.css_class}\n"
+
+    @property
+    def diagrams_node(self):
+        if self._diagrams_node is None:
+            from diagrams.k8s.compute import Pod as P
+
+            self._diagrams_node = P(self.label)
+
+        return self._diagrams_node
+
+
+class CollapsedGroup(GraphNode):
+    __slots__ = ("count", "_diagrams_node")
+
+    def __init__(
+        self,
+        name: str,
+        uid: str,
+        namespace: str | None,
+        count: int,
+        app: str | None = None,
+        system: str | None = None
+    ):
+        super().__init__('group_', name, uid, namespace=namespace, app=app, system=system)
+
+        self.count = count
+        self._diagrams_node: NS | None = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} ({self.count} objects)"
+
+    def iter_mermaid_js_code(self, fragment_cache: FragmentCache | None = None) -> Iterator[str]:
+        yield f"{self.id}[[\"{self.label}\"]]\n"
+
+    @property
+    def diagrams_node(self):
+        if self._diagrams_node is None:
+            from diagrams.k8s.group import NS
+
+            self._diagrams_node = NS(self.label)
+
+        return self._diagrams_node
+
+
+class Cluster(SubGraph):
+    def __init__(self, name: str, uid: str):
+        super().__init__('Cluster', name, uid)
+
+        self.color = "#FDF6E3"
+
+
 class App(SubGraph):
     def __init__(self, name: str, uid: str):
         super().__init__('App', name, uid)
 
         self.color = "#EBF3E7"
 
-    def to_mermaid_js_code(self) -> str:
-        code = super().to_mermaid_js_code()
+    def iter_fragment(self) -> Iterator[str | SubGraph]:
+        yield from super().iter_fragment()
 
         for graph_node in self.graph_nodes.values():
-            code += graph_node.relations_to_mermaid_js_code()
-
-        return code
+            relations = graph_node.relations_to_mermaid_js_code()
+            if relations:
+                yield relations
 
 
 class System(SubGraph):
@@ -352,37 +622,58 @@ class System(SubGraph):
 
         self.color = "#E5F5FD"
 
-    def to_mermaid_js_code(self) -> str:
-        code = super().to_mermaid_js_code()
+    def iter_fragment(self) -> Iterator[str | SubGraph]:
+        yield from super().iter_fragment()
 
         for graph_node in self.graph_nodes.values():
-            code += graph_node.relations_to_mermaid_js_code()
-
-        return code
+            relations = graph_node.relations_to_mermaid_js_code()
+            if relations:
+                yield relations
 
 
 class Namespace(SubGraph):
-    def __init__(self, name: str, uid: str, status_phase: str):
-        super().__init__('Namespace', name, uid)
+    def __init__(
+        self,
+        name: str,
+        uid: str,
+        status_phase: str,
+        object_uid: str | None = None,
+        object_name: str | None = None
+    ):
+        super().__init__('Namespace', name, uid, object_uid=object_uid, object_name=object_name)
 
         self.color = "#f3e7f0"
         self.status_phase = status_phase
         self.graph_nodes = dict()
 
     @classmethod
-    def from_object(cls, namespace: V1Namespace, uid: str) -> Self:
+    def from_object(cls, namespace: "V1Namespace", uid: str) -> Self:
         metadata: V1ObjectMeta = namespace.metadata
 
         return cls(
             name=metadata.name,
             uid=uid,
+            object_uid=metadata.uid,
+            object_name=metadata.name,
             status_phase=namespace.status.phase
         )
 
-    def to_mermaid_js_code(self) -> str:
-        code = super().to_mermaid_js_code()
+    @classmethod
+    def from_dict(cls, namespace: dict, uid: str) -> Self:
+        metadata = namespace["metadata"]
 
-        for graph_node in self.graph_nodes.values():
-            code += graph_node.relations_to_mermaid_js_code()
+        return cls(
+            name=metadata["name"],
+            uid=uid,
+            object_uid=metadata.get("uid"),
+            object_name=metadata["name"],
+            status_phase=namespace.get("status", {}).get("phase")
+        )
 
-        return code
+    def iter_fragment(self) -> Iterator[str | SubGraph]:
+        yield from super().iter_fragment()
+
+        for graph_node in self.graph_nodes.values():
+            relations = graph_node.relations_to_mermaid_js_code()
+            if relations:
+                yield relations
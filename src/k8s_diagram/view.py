@@ -0,0 +1,163 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from k8s_diagram.resources import NAMESPACES, OWNERSHIPS, PODS, RESOURCES, SERVICES, STATEFUL_SETS, Resource
+from k8s_diagram.types.base import GraphNode
+
+SELECTIONS: list[tuple[Resource, Resource]] = [(SERVICES, PODS), (STATEFUL_SETS, PODS)]
+PRIMITIVES: list[tuple[Resource, Resource]] = SELECTIONS + [
+    (owner, owned) for owned, owners in OWNERSHIPS for owner in owners
+]
+KINDS: dict[str, Resource] = {resource.attribute: resource for resource in RESOURCES[1:]}
+
+NEIGHBOURS: dict[Resource, list[tuple[Resource, bool]]] = {resource: [] for resource in RESOURCES[1:]}
+for holder, target in PRIMITIVES:
+    NEIGHBOURS[holder].append((target, True))
+    NEIGHBOURS[target].append((holder, False))
+
+
+@dataclass(frozen=True)
+class Step:
+    resource: Resource
+    forward: bool
+
+    def follow(self, graph_nodes: Iterable[GraphNode], reverse: dict[str, list[GraphNode]]) -> list[GraphNode]:
+        followed: dict[str, GraphNode] = dict()
+        for graph_node in graph_nodes:
+            if self.forward:
+                candidates = (graph_node.related_nodes or dict()).values()
+            else:
+                candidates = reverse.get(graph_node.id, ())
+
+            for candidate in candidates:
+                if isinstance(candidate, self.resource.graph_node_type):
+                    followed[candidate.id] = candidate
+
+        return list(followed.values())
+
+
+@dataclass(frozen=True)
+class Link:
+    holder: Resource
+    target: Resource
+    steps: tuple[Step, ...]
+
+    @classmethod
+    def between(cls, source: Resource, steps: tuple[Step, ...]) -> "Link":
+        target = steps[-1].resource
+        if steps[0].forward or steps[-1].forward:
+            return cls(source, target, steps)
+
+        kinds = [source] + [step.resource for step in steps[:-1]]
+        reversed_steps = tuple(Step(kind, not step.forward) for kind, step in zip(reversed(kinds), reversed(steps)))
+
+        return cls(target, source, reversed_steps)
+
+    def primitives(self) -> Iterable[tuple[Resource, Resource]]:
+        previous = self.holder
+        for step in self.steps:
+            yield (previous, step.resource) if step.forward else (step.resource, previous)
+            previous = step.resource
+
+
+@dataclass
+class View:
+    kinds: set[str]
+    relations: set[tuple[str, str]] | None = None
+
+    def resources(self) -> list[Resource]:
+        unknown = set(self.kinds) - KINDS.keys()
+        if unknown:
+            raise ValueError(f"Unknown kinds {sorted(unknown)}, expected some of {sorted(KINDS)}")
+
+        return [resource for resource in RESOURCES[1:] if resource.attribute in self.kinds]
+
+
+def shortest_steps(source: Resource, target: Resource | None, through: set[Resource] | None) -> dict[Resource, tuple[Step, ...]]:
+    paths: dict[Resource, tuple[Step, ...]] = {source: ()}
+    stops: dict[Resource, tuple[Step, ...]] = dict()
+
+    queue = deque([source])
+    while queue:
+        kind = queue.popleft()
+        for neighbour, forward in NEIGHBOURS[kind]:
+            if neighbour in paths:
+                continue
+
+            paths[neighbour] = paths[kind] + (Step(neighbour, forward),)
+            if neighbour is target or (target is None and neighbour not in through):
+                stops[neighbour] = paths[neighbour]
+            elif through is None or neighbour in through:
+                queue.append(neighbour)
+
+    return stops
+
+
+@dataclass
+class FetchPlan:
+    resources: list[Resource]
+    shown: list[Resource]
+    links: list[Link] = field(default_factory=list)
+    metadata_only: set[Resource] = field(default_factory=set)
+    associate_stages: list[str] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, view: View | None) -> "FetchPlan":
+        if view is None:
+            return cls(list(RESOURCES), list(RESOURCES[1:]))
+
+        shown = view.resources()
+        links = cls.plan_links(view, shown)
+
+        needed = {NAMESPACES, *shown}
+        primitives = set()
+        for link in links:
+            needed.update(step.resource for step in link.steps)
+            primitives.update(link.primitives())
+
+        resources = [resource for resource in RESOURCES if resource in needed]
+        metadata_only = {
+            resource
+            for resource in resources
+            if resource is not NAMESPACES and resource not in shown and resource.metadata_path is not None
+        }
+
+        stages = []
+        if any(selection in primitives for selection in SELECTIONS):
+            stages.append("index_pod_labels")
+        ownerships = primitives.difference(SELECTIONS)
+        if ownerships:
+            stages.append("index_owners")
+        stages.extend(f"associate_{resource.attribute}_with_namespaces" for resource in shown)
+        if (SERVICES, PODS) in primitives:
+            stages.append("associate_pods_with_services")
+        if (STATEFUL_SETS, PODS) in primitives:
+            stages.append("associate_pods_with_stateful_sets")
+        if ownerships:
+            stages.append("associate_owners")
+        stages.append("associate_view")
+
+        return cls(resources, shown, links, metadata_only, stages)
+
+    @staticmethod
+    def plan_links(view: View, shown: list[Resource]) -> list[Link]:
+        links = []
+
+        if view.relations is None:
+            hidden = set(RESOURCES[1:]).difference(shown)
+            for position, source in enumerate(shown):
+                for target, steps in shortest_steps(source, None, hidden).items():
+                    if target in shown[position + 1:]:
+                        links.append(Link.between(source, steps))
+
+            return links
+
+        for source_kind, target_kind in view.relations:
+            source, target = KINDS.get(source_kind), KINDS.get(target_kind)
+            if source not in shown or target not in shown or source is target:
+                raise ValueError(f"Relation {source_kind} - {target_kind} must join two different shown kinds")
+
+            links.append(Link.between(source, shortest_steps(source, target, None)[target]))
+
+        return links
@@ -0,0 +1,199 @@
+import itertools
+import threading
+from typing import Iterator, Self
+
+from kubernetes.client import ApiException
+from kubernetes.watch import Watch
+
+from k8s_diagram.parser import Parser
+from k8s_diagram.resources import NAMESPACES, RESOURCES, Resource
+from k8s_diagram.types.base import Graph, GraphNode
+from k8s_diagram.types.kubernetes import Namespace
+
+
+class Watcher:
+    def __init__(self, parser: Parser, timeout_seconds: int = 300, retry_seconds: float = 5.0):
+        self.parser = parser
+        self.timeout_seconds = timeout_seconds
+        self.retry_seconds = retry_seconds
+
+        self.lock = threading.RLock()
+        self.dirty: set[str] = set()
+        self.errors: list[Exception] = []
+        self.object_nodes: dict[Resource, dict[str, GraphNode]] = dict()
+        self.members: dict[str, dict[Resource, dict[str, GraphNode]]] = dict()
+        self.system_ids: dict[str, list[str]] = dict()
+        self.counters: dict[Resource, Iterator[int]] = dict()
+
+        self._watches: list[Watch] = []
+        self._threads: list[threading.Thread] = []
+        self._stopped = threading.Event()
+
+    def start(self, max_workers: int = 1) -> Self:
+        self.parser.systems = dict()
+        self.parser.fetch(max_workers=max_workers)
+
+        with self.lock:
+            for resource in RESOURCES:
+                self.index_resource(resource)
+
+        for resource in self.parser.plan.resources:
+            for namespace_name in self.watched_namespaces(resource):
+                thread = threading.Thread(target=self.watch, args=(resource, namespace_name), daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        for watch in self._watches:
+            watch.stop()
+
+    def graph(self, included_namespaces: set[str] = None, excluded_namespaces: set[str] = None) -> Graph:
+        with self.lock:
+            if self.dirty:
+                for namespace_name in self.dirty:
+                    self.rebuild_namespace(namespace_name)
+
+                self.dirty.clear()
+                self.parser.invalidate_graph()
+
+            return self.parser.graph(included_namespaces=included_namespaces, excluded_namespaces=excluded_namespaces)
+
+    def watched_namespaces(self, resource: Resource) -> list[str | None]:
+        if self.parser.included_namespaces is None or not resource.namespaced:
+            return [None]
+
+        return sorted(self.parser.included_namespaces)
+
+    def watch(self, resource: Resource, namespace_name: str | None = None) -> None:
+        watch = Watch()
+        self._watches.append(watch)
+
+        watch_function = self.parser.watch_function(resource, namespace_name)
+        resource_version = self.parser.resource_version(resource, namespace_name)
+
+        while not self._stopped.is_set():
+            try:
+                events = watch.stream(
+                    watch_function,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=self.timeout_seconds,
+                )
+
+                for event in events:
+                    resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+
+                    with self.lock:
+                        self.apply(resource, event)
+            except ApiException as e:
+                if e.status == 410:
+                    with self.lock:
+                        self.relist(resource)
+                        resource_version = self.parser.resource_version(resource, namespace_name)
+                else:
+                    self.errors.append(e)
+                    self._stopped.wait(self.retry_seconds)
+            except Exception as e:
+                self.errors.append(e)
+                self._stopped.wait(self.retry_seconds)
+
+    def apply(self, resource: Resource, event: dict) -> None:
+        metadata = event["raw_object"]["metadata"]
+        self.parser.resource_versions[resource.graph_node_type] = metadata["resourceVersion"]
+
+        if event["type"] not in ("ADDED", "MODIFIED", "DELETED"):
+            return
+
+        graph_nodes: dict[str, GraphNode] = getattr(self.parser, resource.attribute)
+        existing = self.object_nodes[resource].get(metadata["uid"])
+
+        graph_node = None
+        if event["type"] != "DELETED":
+            uid = existing.uid if existing is not None else f"{self.parser.uid_prefix}{next(self.counters[resource])}"
+            graph_node = self.parser.annotate(resource.graph_node_type.from_dict(event["raw_object"], uid), event["raw_object"])
+
+            if resource is NAMESPACES and not self.parser.includes_namespace(graph_node.name):
+                graph_node = None
+
+        if existing is not None:
+            del self.object_nodes[resource][metadata["uid"]]
+            graph_nodes.pop(resource.key(existing), None)
+            self.forget(resource, existing)
+
+        if graph_node is None:
+            return
+
+        graph_nodes[resource.key(graph_node)] = graph_node
+        self.object_nodes[resource][graph_node.object_uid] = graph_node
+        self.remember(resource, graph_node)
+
+    def relist(self, resource: Resource) -> None:
+        for graph_node in self.object_nodes[resource].values():
+            self.forget(resource, graph_node)
+
+        self.parser.parse_resource(resource)
+        self.index_resource(resource)
+
+    def index_resource(self, resource: Resource) -> None:
+        graph_nodes: dict[str, GraphNode] = getattr(self.parser, resource.attribute)
+
+        self.object_nodes[resource] = {gn.object_uid: gn for gn in graph_nodes.values()}
+        self.counters[resource] = itertools.count(len(graph_nodes) + 1)
+
+        for graph_node in graph_nodes.values():
+            self.remember(resource, graph_node)
+
+    def remember(self, resource: Resource, graph_node: GraphNode) -> None:
+        namespace_name = self.namespace_of(graph_node)
+
+        members = self.members.setdefault(namespace_name, dict()).setdefault(resource, dict())
+        members[resource.key(graph_node)] = graph_node
+
+        self.dirty.add(namespace_name)
+
+    def forget(self, resource: Resource, graph_node: GraphNode) -> None:
+        namespace_name = self.namespace_of(graph_node)
+
+        members = self.members.get(namespace_name, dict()).get(resource)
+        if members is not None:
+            members.pop(resource.key(graph_node), None)
+
+        self.dirty.add(namespace_name)
+
+    def rebuild_namespace(self, namespace_name: str) -> None:
+        for system_id in self.system_ids.pop(namespace_name, []):
+            self.parser.systems.pop(system_id, None)
+
+        namespace = self.parser.namespaces.get(namespace_name)
+        if namespace is None:
+            return
+
+        namespace.graph_nodes = dict()
+
+        parser = Parser(api_client=self.parser.api_client, namespaces={namespace_name: namespace}, view=self.parser.view)
+        members = self.members.get(namespace_name, dict())
+        for resource in RESOURCES:
+            if resource is NAMESPACES:
+                continue
+
+            graph_nodes = dict(members.get(resource, dict()))
+            for graph_node in graph_nodes.values():
+                graph_node.related_nodes = None
+
+            setattr(parser, resource.attribute, graph_nodes)
+
+        parser.associate().organize()
+
+        self.parser.systems.update(parser.systems)
+        self.system_ids[namespace_name] = list(parser.systems.keys())
+
+    @staticmethod
+    def namespace_of(graph_node: GraphNode) -> str:
+        if isinstance(graph_node, Namespace):
+            return graph_node.name
+
+        return graph_node.namespace
@@ -0,0 +1,122 @@
+import base64
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from k8s_diagram.images import ImageCache, MermaidInkBackend
+
+IMAGE = b"\x89PNG\r\n\x1a\nstand-in image"
+
+
+class MermaidInkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.paths.append(self.path)
+
+        if not self.path.startswith("/img/"):
+            self.send_error(404)
+            return
+
+        code = base64.b64decode(self.path[len("/img/"):]).decode("utf-8")
+        content = IMAGE + code.encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MermaidInkHandler)
+    server.paths = []
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def base_url(server) -> str:
+    host, port = server.server_address
+
+    return f"http://{host}:{port}"
+
+
+def test_fetch_serves_image_from_local_server(server):
+    backend = MermaidInkBackend(base_url=base_url(server) + "/", timeout=5.0)
+
+    content = backend.fetch("graph TB\na --> b\n")
+
+    assert content == IMAGE + b"graph TB\na --> b\n"
+    assert server.paths == ["/img/" + base64.b64encode(b"graph TB\na --> b\n").decode("ascii")]
+
+
+def test_fetch_raises_on_http_error(server):
+    import requests
+
+    backend = MermaidInkBackend(base_url=base_url(server) + "/missing", timeout=5.0)
+
+    with pytest.raises(requests.HTTPError):
+        backend.fetch("graph TB\n")
+
+
+def test_fetch_serves_cached_image_without_request(server, tmp_path):
+    backend = MermaidInkBackend(base_url=base_url(server), timeout=5.0, cache=ImageCache(str(tmp_path)))
+
+    first = backend.fetch("graph TB\na\n")
+    second = backend.fetch("graph TB\na\n")
+
+    assert first == second
+    assert len(server.paths) == 1
+
+
+def test_evict_removes_least_recently_used_images(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=250)
+
+    for age, key in enumerate(["a", "b", "c"]):
+        cache.put(key, b"x" * 100)
+        os.utime(cache.path(key), (1000 + age, 1000 + age))
+
+    cache.put("d", b"x" * 100)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == b"x" * 100
+    assert cache.get("d") == b"x" * 100
+
+
+def test_get_refreshes_recency(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=250)
+
+    cache.put("a", b"x" * 100)
+    cache.put("b", b"x" * 100)
+    os.utime(cache.path("a"), (1000, 1000))
+    os.utime(cache.path("b"), (2000, 2000))
+
+    assert cache.get("a") is not None
+    cache.put("c", b"x" * 100)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+
+
+def test_get_is_a_hit_when_evicted_after_read(tmp_path, monkeypatch):
+    cache = ImageCache(str(tmp_path))
+    cache.put("a", b"image")
+
+    def evicted(path, *args, **kwargs):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+
+    assert cache.get("a") == b"image"